@@ -1,33 +1,40 @@
-import os
+import io
+import itertools
 import logging
-import re
 from datetime import datetime
-from typing import List, Set
+from typing import Optional
 
 import gitlab
 import gitlab.exceptions
 
 from .release_parser import ReleaseInfo
 from .gitlab_rep import GitlabRep
+from .jira_tasks import JIRA_TASK_PATTERN, extract_jira_tasks
 
 logger = logging.getLogger(__name__)
 
-JIRA_TASK_PATTERN = re.compile(r'\[([\w\-]+)\]')
 JIRA_BASE_URL = "https://smfactory.atlassian.net/browse"
+CHANGELOG_TITLE = "# Changelog"
+
+def _find_title_end(content: str) -> int:
+    """Return the offset right after the "# Changelog" title line, or -1 if there is no title."""
+    if content.startswith(CHANGELOG_TITLE):
+        start = 0
+    else:
+        start = content.find("\n" + CHANGELOG_TITLE)
+        if start < 0:
+            return -1
+        start += 1
+    end = content.find("\n", start)
+    return len(content) if end < 0 else end + 1
 
 class ChangelogGenerator:
+    # (project id, branch name) pairs known to exist, shared across instances within one process
+    _known_branches: set[tuple[int, str]] = set()
+
     def __init__(self):
         pass
 
-    def _extract_jira_tasks(self, items: List[str]) -> Set[str]:
-        """Extract unique Jira task IDs from a list of strings."""
-        tasks = set()
-        for item in items:
-            match = JIRA_TASK_PATTERN.search(item)
-            if match:
-                tasks.add(match.group(1))
-        return tasks
-
     def _format_task_link(self, description: str) -> str:
         """Format a task with Jira hyperlink."""
         match = JIRA_TASK_PATTERN.search(description)
@@ -35,65 +42,60 @@ class ChangelogGenerator:
             # If task is not found, just return the original text
             return f"- {description}"
         task_id = match.group(1)
-        return f"- [[{task_id}]({JIRA_BASE_URL}/{task_id})] {description.replace(f'[{task_id}]', '').strip()}"
+        # Cut the "[TASK-ID]" marker out by its span instead of re-scanning with str.replace
+        rest = (description[:match.start()] + description[match.end():]).strip()
+        return f"- [[{task_id}]({JIRA_BASE_URL}/{task_id})] {rest}"
 
-    def generate_changelog_entries(self, info: ReleaseInfo, rep: GitlabRep) -> str:
+    def generate_changelog_entries(self, info: ReleaseInfo, rep: GitlabRep, buf: Optional[io.StringIO] = None) -> str:
         """
         Build changelog entries for the provided ReleaseInfo and repository.
 
         Returns a string fragment that can be inserted into an existing CHANGELOG.md
         (it already starts with a separating blank line).
+        If `buf` is given, the entries are written into it instead and an empty string is returned.
         This method is public so callers can reuse the changelog-building logic
         without performing the push.
         """
+        out = buf if buf is not None else io.StringIO()
+        w = out.write
         current_date = datetime.now().strftime("%d-%m-%Y")
-        new_entries: list[str] = []
-        new_entries.append("\n")  # Add blank line for separation
+        w("\n")  # Add blank line for separation
 
-        for target in info.targets:
-            release_tag = target.tag_name + "-release"
-            new_entries.append(f"## Version `{release_tag}` - {current_date}\n\n")
+        # Collect all Jira tasks once: they are the same for every target
+        sorted_tasks = sorted(extract_jira_tasks(itertools.chain(info.features, info.bug_fixes)))
 
-            # Collect all Jira tasks
-            feature_tasks = self._extract_jira_tasks(info.features)
-            bugfix_tasks = self._extract_jira_tasks(info.bug_fixes)
-            all_tasks = feature_tasks.union(bugfix_tasks)
+        for target in info.targets:
+            release_tag = target.release_tag_name
+            w(f"## Version `{release_tag}` - {current_date}\n\n")
 
             # Add Jira tasks section if there are any tasks
-            if all_tasks:
-                new_entries.append("Version related with tasks:")
-                sorted_tasks = sorted(all_tasks)
-                for i, task in enumerate(sorted_tasks):
-                    if i == len(sorted_tasks) - 1:  # last element
-                        new_entries.append(f"`{task}`")
-                    else:
-                        new_entries.append(f"`{task}`, ")
-                new_entries.append("\n")
+            if sorted_tasks:
+                w("Version related with tasks:" + ", ".join([f"`{task}`" for task in sorted_tasks]) + "\n")
 
             # Add firmware files section
-            new_entries.append("### Firmware files:\n\n")
+            w("### Firmware files:\n\n")
             tag_url = rep.get_tag(release_tag)
             bin_path = f"build/{target.target_name}.bin"
             container_path = f"build/{target.container_name}"
 
-            new_entries.append(f"- [{release_tag}]({tag_url}/{bin_path})\n")
-            new_entries.append(f"- [container]({tag_url}/{container_path})\n\n")
+            w(f"- [{release_tag}]({tag_url}/{bin_path})\n")
+            w(f"- [container]({tag_url}/{container_path})\n\n")
 
             # Add Features section if exists
             if info.features:
-                new_entries.append("### New Features:\n\n")
+                w("### New Features:\n\n")
                 for feature in info.features:
-                    new_entries.append(self._format_task_link(feature) + "\n")
-                new_entries.append("\n")
+                    w(self._format_task_link(feature) + "\n")
+                w("\n")
 
             # Add Bug Fixes section if exists
             if info.bug_fixes:
-                new_entries.append("### Bug Fixes:\n\n")
+                w("### Bug Fixes:\n\n")
                 for fix in info.bug_fixes:
-                    new_entries.append(self._format_task_link(fix) + "\n")
-                new_entries.append("\n")
+                    w(self._format_task_link(fix) + "\n")
+                w("\n")
 
-        return ''.join(new_entries)
+        return out.getvalue() if buf is None else ""
 
     def update_changelog_and_push(self, info: ReleaseInfo, rep: GitlabRep, branch_name: str, commit_message: str) -> str:
         """
@@ -113,50 +115,54 @@ class ChangelogGenerator:
         # Try to get existing content from GitLab
         project = rep.get_project_obj()
         try:
-            # Try to create branch if it doesn't exist
-            try:
-                project.branches.create({
-                    'branch': branch_name,
-                    'ref': project.default_branch
-                })
-                logger.info(f"Created new branch: {branch_name}")
-            except gitlab.exceptions.GitlabCreateError:
-                logger.info(f"Branch {branch_name} already exists")
+            # Try to create branch if it doesn't exist (skipped if already ensured in this process)
+            branch_key = (project.id, branch_name)
+            if branch_key not in ChangelogGenerator._known_branches:
+                try:
+                    project.branches.create({
+                        'branch': branch_name,
+                        'ref': project.default_branch
+                    })
+                    logger.info(f"Created new branch: {branch_name}")
+                except gitlab.exceptions.GitlabCreateError:
+                    logger.info(f"Branch {branch_name} already exists")
+                ChangelogGenerator._known_branches.add(branch_key)
 
             # Try to get existing content
             try:
                 file_obj = project.files.get(file_path='CHANGELOG.md', ref=branch_name)
-                content = file_obj.decode().decode('utf-8').splitlines(keepends=True)
+                content = file_obj.decode().decode('utf-8')
             except gitlab.exceptions.GitlabGetError:
-                content = ["# Changelog\n"]
-
-            # Generate fragment with new entries and insert after title
-            new_entries = self.generate_changelog_entries(info, rep)
-            for i, line in enumerate(content):
-                if line.startswith("# Changelog"):
-                    content[i:i+1] = [line] + [new_entries]
-                    break
+                file_obj = None
+                content = "# Changelog\n"
+
+            # Write the head (up to and including the title line), the new entries and the tail
+            buf = io.StringIO()
+            insert_at = _find_title_end(content)
+            if insert_at < 0:
+                buf.write(content)
+            else:
+                buf.write(content[:insert_at])
+                self.generate_changelog_entries(info, rep, buf)
+                buf.write(content[insert_at:])
 
             # Prepare content for GitLab API
-            full_content = ''.join(content)
-
-            # Update or create file using GitLab API
-            file_data = {
-                'branch': branch_name,
-                'commit_message': commit_message,
-                'content': full_content,
-                'file_path': 'CHANGELOG.md'
-            }
+            full_content = buf.getvalue()
 
-            try:
-                # Try to update existing file
-                file_obj = project.files.get(file_path='CHANGELOG.md', ref=branch_name)
+            # Update or create file using GitLab API; the file object fetched above
+            # doubles as the existence check, so no second files.get round-trip is needed
+            if file_obj is not None:
                 file_obj.content = full_content
                 file_obj.save(branch=branch_name, commit_message=commit_message)
                 logger.info("Updated CHANGELOG.md in branch %s", branch_name)
-            except gitlab.exceptions.GitlabGetError:
+            else:
                 # File doesn't exist, create it
-                project.files.create(file_data)
+                project.files.create({
+                    'branch': branch_name,
+                    'commit_message': commit_message,
+                    'content': full_content,
+                    'file_path': 'CHANGELOG.md'
+                })
                 logger.info("Created CHANGELOG.md in branch %s", branch_name)
 
             # Create Merge Request with CHANGELOG changes to the default repository branch
@@ -4,19 +4,37 @@ import shutil
 import logging
 import os
 import hashlib
+import itertools
 import json
+import mmap
 import threading
-from datetime import datetime
-import re
-from typing import List, Set
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
 
 from .release_parser import ReleaseInfo
+from .jira_tasks import extract_jira_tasks
 
 # ---------- logging ----------
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-JIRA_TASK_PATTERN = re.compile(r'\[([\w\-]+)\]')
+_UTC = timezone.utc
+_BUILT_AT_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+_GIT_IDENTITY = ["-c", "user.name=ci_bot", "-c", "user.email=ci_bot@unic-lab.by"]
+
+
+def _sha256_file(path: str) -> str:
+    """Return the hex SHA256 digest of a file, hashed entirely in C (no Python-level chunk loop)."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Python < 3.11: feed the whole file as one contiguous buffer
+        h = hashlib.sha256()
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        return h.hexdigest()
 
 class FirmwareStorePusher:
     """
@@ -24,11 +42,11 @@ class FirmwareStorePusher:
     A directory named after the release tag is created in the store and binaries are copied there.
 
     The implementation is optimized for repeated calls: the repository clone is created lazily
-    and reused between instances of this class for the same (auth_url, branch) pair.
+    and reused between instances of this class for the same (repo_url, branch) pair.
     The cloned repository will be removed when the last instance is closed or during cleanup.
     """
 
-    # shared state: map (auth_url, branch) -> { 'tmp': path, 'refs': int }
+    # shared state: map (repo_url, branch) -> { 'tmp': path, 'refs': int, 'git': Lock }
     _shared_lock = threading.Lock()
     _shared_repos: dict = {}
 
@@ -36,15 +54,19 @@ class FirmwareStorePusher:
         if not repo_url or not token:
             raise RuntimeError("FW_STORE_REPO_URL/FW_PUSH_TOKEN are required")
         self.repo_url = repo_url
-        self.auth_url = repo_url.replace("https://", f"https://oauth2:{token}@", 1)
+        parts = urlsplit(repo_url)
+        if parts.scheme == "https":
+            parts = parts._replace(netloc=f"oauth2:{token}@{parts.netloc}")
+        self.auth_url = urlunsplit(parts)
         self.branch = branch
-        # key for shared cache
-        self._key = (self.auth_url, self.branch)
+        # key for shared cache: the token is kept out of it so a rotated token reuses the clone
+        self._key = (self.repo_url, self.branch)
         # register reference
         with FirmwareStorePusher._shared_lock:
             entry = FirmwareStorePusher._shared_repos.get(self._key)
             if entry is None:
-                FirmwareStorePusher._shared_repos[self._key] = { 'tmp': None, 'refs': 1 }
+                # 'git' serializes index/worktree operations on the shared clone between threads
+                FirmwareStorePusher._shared_repos[self._key] = { 'tmp': None, 'refs': 1, 'git': threading.Lock() }
             else:
                 entry['refs'] += 1
 
@@ -53,7 +75,7 @@ class FirmwareStorePusher:
         subprocess.run(args, cwd=cwd, check=True)
 
     def _ensure_clone(self):
-        """Ensure the repository is cloned into a temporary dir for this auth_url/branch."""
+        """Ensure the repository is cloned into a temporary dir for this repo_url/branch."""
         with FirmwareStorePusher._shared_lock:
             entry = FirmwareStorePusher._shared_repos[self._key]
             if entry['tmp']:
@@ -61,13 +83,9 @@ class FirmwareStorePusher:
             # create tmp and clone
             tmp = tempfile.mkdtemp(prefix="fw-store-")
             try:
-                user_name = "ci_bot"
-                user_email = "ci_bot@unic-lab.by"
-                # set global config once (affects environment)
-                subprocess.run(['git', 'config', '--global', 'user.email', user_email], check=True)
-                subprocess.run(['git', 'config', '--global', 'user.name', user_name], check=True)
-
-                self._run(["git", "clone", "--depth=1", self.auth_url, tmp])
+                # partial + sparse clone: only tree metadata and top-level files are fetched,
+                # tag folders are added to the checkout on demand in push_release
+                self._run(["git", "clone", "--depth=1", "--filter=blob:none", "--sparse", self.auth_url, tmp])
             except Exception:
                 # cleanup on failure
                 shutil.rmtree(tmp, ignore_errors=True)
@@ -83,39 +101,25 @@ class FirmwareStorePusher:
         `checksums.txt` and appends that hash as the final line.
         """
         # checksums: compute hashes for files in the directory, excluding the checksum file itself
-        filenames = [f for f in sorted(os.listdir(dest_dir)) if f != "checksums.txt"]
+        with os.scandir(dest_dir) as it:
+            entries = sorted(
+                (e for e in it if e.name != "checksums.txt" and e.is_file()),
+                key=lambda e: e.name,
+            )
         checksums_path = os.path.join(dest_dir, "checksums.txt")
+        # hashlib releases the GIL while hashing, so files are hashed in parallel;
+        # map() keeps the results in the sorted filename order
+        digests = []
+        if entries:
+            with ThreadPoolExecutor(max_workers=min(8, len(entries))) as ex:
+                digests = list(ex.map(_sha256_file, (e.path for e in entries)))
         # Write hashes for all files except checksums.txt
         with open(checksums_path, "w", encoding="utf-8") as ch:
-            for fname in filenames:
-                full = os.path.join(dest_dir, fname)
-                if os.path.isfile(full):
-                    h = hashlib.sha256()
-                    with open(full, "rb") as f:
-                        for chunk in iter(lambda: f.read(65536), b""):
-                            h.update(chunk)
-                    ch.write(f"{h.hexdigest()}  {fname}\n")
-
-    def _extract_jira_tasks(self, items: List[str]) -> Set[str]:
-        """Extract unique Jira task IDs from a list of strings."""
-        tasks = set()
-        for item in items:
-            match = JIRA_TASK_PATTERN.search(item)
-            if match:
-                tasks.add(match.group(1))
-        return tasks
-
-    def push_release(self, info: ReleaseInfo, tag_name: str, src_paths: list[str]) -> None:
-        """
-        Copy files into <tag_name>/ inside the parsed/reused clone, commit and push.
-        Can be called multiple times — the clone will be created only once for the same (repo, branch) pair.
-        """
-        if not tag_name or not src_paths:
-            logger.info("Nothing to publish: tag=%r files=%d", tag_name, len(src_paths) if src_paths is not None else 0)
-            return
-
-        tmp = self._ensure_clone()
+            for entry, digest in zip(entries, digests):
+                ch.write(f"{digest}  {entry.name}\n")
 
+    def _prepare_tag_dir(self, tmp: str, tag_name: str, src_paths: list[str]) -> None:
+        """Copy files into <tag_name>/ of the clone and write checksums.txt and build-info.json next to them."""
         dest_dir = os.path.join(tmp, tag_name)
         os.makedirs(dest_dir, exist_ok=True)
 
@@ -123,7 +127,8 @@ class FirmwareStorePusher:
         copied = 0
         for p in src_paths:
             if os.path.isfile(p):
-                shutil.copy2(p, dest_dir)
+                # plain content copy (kernel fast path); metadata is irrelevant for a git worktree
+                shutil.copyfile(p, os.path.join(dest_dir, os.path.basename(p)))
                 copied += 1
             else:
                 logger.warning("File not found, skip: %s", p)
@@ -139,23 +144,25 @@ class FirmwareStorePusher:
             "pipeline_id": os.getenv("CI_PIPELINE_ID", ""),
             "commit": os.getenv("CI_COMMIT_SHA", ""),
             "tag": tag_name,
-            "built_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "built_at": datetime.now(_UTC).strftime(_BUILT_AT_FORMAT),
         }
-        with open(os.path.join(dest_dir, "build-info.json"), "w", encoding="utf-8") as bf:
-            json.dump(build_info, bf, ensure_ascii=False, indent=2)
+        data = json.dumps(build_info, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with open(os.path.join(dest_dir, "build-info.json"), "wb") as bf:
+            bf.write(data)
 
-        # git add/commit/push
-        self._run(["git", "add", "."], cwd=tmp)
+    def _commit_tag(self, tmp: str, info: ReleaseInfo, tag_name: str) -> bool:
+        """Commit the <tag_name>/ folder. Returns False if there was nothing to commit.
+        Must be called with the clone's git lock held."""
+        # stage only this tag's folder so git doesn't rescan previously published tags
+        self._run(["git", "add", "-A", "--", tag_name], cwd=tmp)
         # if there is nothing to commit — exit quietly
         if subprocess.run(["git", "diff", "--cached", "--quiet"], cwd=tmp).returncode == 0:
             logger.info("No changes to commit for tag %s", tag_name)
-            return
+            return False
 
         # Build extended commit message and include JIRA references when available.
         # Collect JIRA IDs from several sources and append lines like "Refs: JRA-123".
-        feature_tasks = self._extract_jira_tasks(info.features)
-        bugfix_tasks = self._extract_jira_tasks(info.bug_fixes)
-        jira_ids = feature_tasks.union(bugfix_tasks)
+        jira_ids = extract_jira_tasks(itertools.chain(info.features, info.bug_fixes))
 
         # Build commit message: first line summary, then one or more Refs lines.
         lines = [f"Add release binaries for {tag_name}"]
@@ -165,10 +172,77 @@ class FirmwareStorePusher:
                 lines.append(f"Refs: {jid}")
 
         msg = "\n".join(lines)
-        self._run(["git", "commit", "-m", msg], cwd=tmp)
-        self._run(["git", "push", "origin", f"HEAD:{self.branch}"], cwd=tmp)
+        # identity is passed inline instead of spawning `git config --global` per clone
+        self._run(["git", *_GIT_IDENTITY, "commit", "-m", msg], cwd=tmp)
+        return True
+
+    def _push(self, tmp: str) -> None:
+        # push via this instance's auth_url: the shared clone's origin may carry an older token
+        self._run(["git", "push", self.auth_url, f"HEAD:{self.branch}"], cwd=tmp)
+
+    def push_release(self, info: ReleaseInfo, tag_name: str, src_paths: list[str]) -> None:
+        """
+        Copy files into <tag_name>/ inside the parsed/reused clone, commit and push.
+        Can be called multiple times — the clone will be created only once for the same (repo, branch) pair.
+        Safe to call from several threads for different tags: git commands are serialized per clone,
+        copying and hashing of the files run in parallel.
+        """
+        if not tag_name or not src_paths:
+            logger.info("Nothing to publish: tag=%r files=%d", tag_name, len(src_paths) if src_paths is not None else 0)
+            return
+
+        tmp = self._ensure_clone()
+        git_lock = FirmwareStorePusher._shared_repos[self._key]['git']
+        with git_lock:
+            self._run(["git", "sparse-checkout", "add", tag_name], cwd=tmp)
+
+        self._prepare_tag_dir(tmp, tag_name, src_paths)
+
+        # git add/commit/push
+        with git_lock:
+            if not self._commit_tag(tmp, info, tag_name):
+                return
+            self._push(tmp)
         logger.info("Firmware published to store under folder: %s", tag_name)
 
+    def push_releases(self, info: ReleaseInfo, releases: list[tuple[str, list[str]]]) -> None:
+        """
+        Publish several tags at once: every (tag_name, src_paths) pair gets its own folder and commit
+        as with push_release, but the folders are prepared in parallel and all commits go out in a single push.
+        A tag that fails to prepare or commit is logged and skipped; the others are still published.
+        """
+        releases = [(tag_name, src_paths) for tag_name, src_paths in releases if tag_name and src_paths]
+        if not releases:
+            logger.info("Nothing to publish")
+            return
+
+        tmp = self._ensure_clone()
+        git_lock = FirmwareStorePusher._shared_repos[self._key]['git']
+        with git_lock:
+            self._run(["git", "sparse-checkout", "add", *(tag_name for tag_name, _ in releases)], cwd=tmp)
+
+        # copying and hashing release the GIL, so the tag folders are prepared concurrently
+        with ThreadPoolExecutor(max_workers=min(8, len(releases))) as ex:
+            prepared = [(tag_name, ex.submit(self._prepare_tag_dir, tmp, tag_name, src_paths))
+                        for tag_name, src_paths in releases]
+
+        published = []
+        with git_lock:
+            for tag_name, future in prepared:
+                try:
+                    future.result()
+                    if self._commit_tag(tmp, info, tag_name):
+                        published.append(tag_name)
+                except Exception as e:
+                    logger.error("Publish to firmware store failed for tag %s: %s", tag_name, e)
+                    # don't let a half-staged folder slip into the next tag's commit
+                    subprocess.run(["git", "reset", "-q", "--", tag_name], cwd=tmp)
+            if not published:
+                return
+            self._push(tmp)
+        for tag_name in published:
+            logger.info("Firmware published to store under folder: %s", tag_name)
+
     def close(self):
         """Decrease refcount and cleanup cloned repo when no more references exist."""
         with FirmwareStorePusher._shared_lock:
@@ -57,8 +57,7 @@ def main():
         print(f"ERROR: {p} not found", file=sys.stderr)
         sys.exit(1)
 
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = json.loads(p.read_bytes())
 
     tag_only = bool(data.get("upgrade_to_release", False))
     if args.override == "tag-only":
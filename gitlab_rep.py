@@ -1,15 +1,40 @@
 import logging
+import os
+import re
 import subprocess
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
 import gitlab
 import gitlab.exceptions
+import requests
+from requests.adapters import HTTPAdapter
 
 from gitlab.exceptions import GitlabGetError
 from .release_parser import ReleaseInfo
 
 logger = logging.getLogger(__name__)
 
+def _read_text(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+_GIT_IDENTITY = ["-c", "user.name=release_bot", "-c", "user.email=release_bot@unic-lab.by"]
+_COMMIT_SUMMARY_RE = re.compile(r"\[[^\]\n]* ([0-9a-f]{40,64})\]")
+
+def _parse_status(porcelain_v2: str) -> Tuple[Optional[str], bool]:
+    """Parse `git status --porcelain=v2 --branch` output into (HEAD hash or None, has staged changes)."""
+    head = None
+    has_staged = False
+    for line in porcelain_v2.splitlines():
+        if line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+            head = None if oid == "(initial)" else oid
+        elif line[:2] in ("1 ", "2 ", "u ") and line[2] != ".":
+            has_staged = True
+    return head, has_staged
+
 class GitlabRep:
     def __init__(self, gitlab_url: str, project_id: int, token: str, release_info: ReleaseInfo, build_dir: str):
         self._gitlab_url = gitlab_url
@@ -17,10 +42,49 @@ class GitlabRep:
         self._token = token
         self.__build_dir = build_dir
         self.__release_info = release_info
+        # tag name -> browser URL (None if the tag doesn't exist)
+        self._tag_urls: Dict[str, Optional[str]] = {}
+        # tag name -> commit SHA the tag points to
+        self._tag_commits: Dict[str, str] = {}
+        # client and project handle are created lazily and reused for all API calls
+        self._gl: Optional[gitlab.Gitlab] = None
+        self._session: Optional[requests.Session] = None
+        self._project = None
+        # targets may be processed on worker threads: the client is created only once
+        self._project_lock = threading.Lock()
+
+    def _http_session(self) -> requests.Session:
+        if self._session is None:
+            # keep-alive session so subsequent REST calls reuse the TCP/TLS connection
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        return self._session
 
     def get_project_obj(self):
-        gl = gitlab.Gitlab(self._gitlab_url, private_token=self._token)
-        return gl.projects.get(self._project_id)
+        if self._project is None:
+            with self._project_lock:
+                if self._project is None:
+                    if self._gl is None:
+                        self._gl = gitlab.Gitlab(self._gitlab_url, private_token=self._token,
+                                                 session=self._http_session())
+                    self._project = self._gl.projects.get(self._project_id)
+        return self._project
+
+    def for_project(self, project_id: int, token: str) -> "GitlabRep":
+        """
+        Returns a GitlabRep for another project on the same GitLab server.
+        It shares this instance's HTTP session, so its requests reuse the already open connections;
+        the token is sent per client, not stored in the session.
+        """
+        rep = GitlabRep(self._gitlab_url, project_id, token, self.__release_info, self.__build_dir)
+        rep._session = self._http_session()
+        return rep
+
+    def _tag_url(self, name: str) -> str:
+        # web_url comes from the cached project, no extra request
+        return f"{self.get_project_obj().web_url}/-/blob/{name}"
 
     # ---------- TAGS ----------
 
@@ -28,37 +92,98 @@ class GitlabRep:
         """
         Returns the commit hash for the specified tag.
         Raises GitlabGetError if tag is not found.
+        Served from cache if the tag was already fetched or created by this instance.
         """
+        if tag_name in self._tag_commits:
+            return self._tag_commits[tag_name]
+
         project = self.get_project_obj()
         tag = project.tags.get(tag_name)
+        self._tag_commits[tag_name] = tag.commit['id']
         return tag.commit['id']
 
+    def tag_exists(self, name: str) -> bool:
+        """
+        Checks whether the tag exists with a lightweight HEAD request (no tag object is fetched).
+        """
+        if name in self._tag_urls:
+            return self._tag_urls[name] is not None
+
+        project = self.get_project_obj()
+        path = f"/projects/{project.id}/repository/tags/{quote(name, safe='')}"
+        try:
+            self._gl.http_request("head", path)
+        except gitlab.exceptions.GitlabHttpError as e:
+            if e.response_code != 404:
+                raise
+            self._tag_urls[name] = None
+            return False
+
+        self._tag_urls[name] = self._tag_url(name)
+        return True
+
+    def prefetch_tags(self, names: Iterable[str]) -> None:
+        """
+        Resolves several tags with one (paginated) listing instead of a request per tag.
+        Afterwards tag_exists/get_tag/get_tag_commit_hash for these names are answered from cache.
+        """
+        names = {name for name in names if name not in self._tag_urls}
+        if not names:
+            return
+
+        # release tags share their leading version numbers, so only tags with the common
+        # prefix are listed ('^' anchors GitLab's tag search to the start of the name).
+        # Every requested name starts with that prefix, so the filtered listing can only
+        # return more tags than needed, never fewer, and iterator=True follows all pages:
+        # a name missing from the listing does not exist and is cached as absent.
+        prefix = os.path.commonprefix(sorted(names))
+        filters = {"search": f"^{prefix}"} if prefix else {}
+        project = self.get_project_obj()
+        for tag in project.tags.list(**filters, per_page=100, iterator=True):
+            if tag.name in names:
+                self._tag_urls[tag.name] = self._tag_url(tag.name)
+                self._tag_commits[tag.name] = tag.commit['id']
+        for name in names:
+            self._tag_urls.setdefault(name, None)
+
     def get_tag(self, name: str) -> Optional[str]:
         """
         Returns the URL for browser tag view or None if tag doesn't exist.
+        The result is cached per instance; tags created via make_tag update the cache.
         """
+        if name in self._tag_urls:
+            return self._tag_urls[name]
+
         project = self.get_project_obj()
         try:
             tag = project.tags.get(id=name)
         except GitlabGetError:
             logger.info("Tag '%s' not found.", name)
+            self._tag_urls[name] = None
             return None
 
-        # The date can be parsed if required
-        dt_str = tag.commit['created_at']
-        try:
-            parsed = datetime.strptime(dt_str, '%Y-%m-%dT%H:%M:%S.%f%z')
-            logger.info("Found tag '%s' created at %s", name, parsed.isoformat())
-        except Exception:
-            logger.debug("Could not parse tag date: %s", dt_str)
-
-        repo_url = f"{project.web_url}/-/blob/{name}"
+        # The date is only used for logging, so it is parsed only when the record will be emitted;
+        # fromisoformat is a C fast path compared to strptime's format interpreter
+        # (the 'Z' suffix is rewritten because fromisoformat only accepts it from Python 3.11)
+        if logger.isEnabledFor(logging.INFO):
+            dt_str = tag.commit['created_at']
+            try:
+                parsed = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
+                logger.info("Found tag '%s' created at %s", name, parsed.isoformat())
+            except Exception:
+                logger.debug("Could not parse tag date: %s", dt_str)
+
+        repo_url = self._tag_url(name)
+        self._tag_urls[name] = repo_url
+        self._tag_commits[name] = tag.commit['id']
         return repo_url
 
     def make_tag(self, name: str, desc: str, ref: str) -> str:
         project = self.get_project_obj()
         tag = project.tags.create({'tag_name': name, 'ref': ref, 'message': desc})
-        repo_url = f"{project.web_url}/-/blob/{name}"
+        repo_url = self._tag_url(name)
+        self._tag_urls[name] = repo_url
+        self._tag_commits[name] = tag.commit['id']
         logger.info("Created tag '%s' at %s", name, repo_url)
         return repo_url
 
@@ -66,25 +191,27 @@ class GitlabRep:
 
     def build_project(self) -> None:
         """
-        Project build (CMake+Ninja), optionally with SERVICE_FIRMWARE.
+        Project build (CMake+Ninja) of all release targets, optionally with SERVICE_FIRMWARE.
         """
         logger.info("Configuring CMake...")
-        subprocess.run(["cmake", "-B", self.__build_dir, "-G", "Ninja"], check=True)
-
-        logger.info("Cleaning previous build...")
-        subprocess.run(["cmake", "--build", self.__build_dir, "--target=clean"], check=True)
-
+        configure_cmd = ["cmake", "-S", ".", "-B", self.__build_dir, "-G", "Ninja"]
         if self.__release_info.is_service_firmware:
             logger.info("Enabling SERVICE_FIRMWARE=ON")
-            subprocess.run(["cmake", "-S", ".", "-B", self.__build_dir, "-DSERVICE_FIRMWARE=ON"], check=True)
+            configure_cmd.append("-DSERVICE_FIRMWARE=ON")
+        subprocess.run(configure_cmd, check=True)
+
+        # Ninja tracks dependencies itself, so a clean is only done on request
+        if self.__release_info.force_clean:
+            logger.info("Cleaning previous build...")
+            subprocess.run(["cmake", "--build", self.__build_dir, "--target=clean"], check=True)
 
         if not self.__release_info.targets:
             raise ValueError("No targets specified for build")
 
-        # In this version, we only build the first target from the list
-        target = self.__release_info.targets[0]
-        logger.info("Building target: %s", target.target_name)
-        subprocess.run(["cmake", "--build", self.__build_dir, f"--target={target.target_name}"], check=True)
+        # All targets go into one build invocation so the build tool runs them in parallel
+        targets = [target.target_name for target in self.__release_info.targets]
+        logger.info("Building targets: %s", ", ".join(targets))
+        subprocess.run(["cmake", "--build", self.__build_dir, "--target", *targets], check=True)
 
     # ---------- COMMIT/PUSH ----------
 
@@ -98,36 +225,36 @@ class GitlabRep:
         token = self._token
         authenticated_repo_url = repo_url.replace('https://', f'https://oauth2:{token}@')
 
-        # git config
-        user_name = "release_bot"
-        user_email = "release_bot@unic-lab.by"
-        subprocess.run(['git', 'config', 'user.email', user_email], check=True, cwd=repo_dir)
-        subprocess.run(['git', 'config', 'user.name', user_name], check=True, cwd=repo_dir)
+        # Stage binaries with a single git invocation
+        logger.info("Adding files: %s", ", ".join(binaries))
+        subprocess.run(['git', 'add', '--', *binaries], check=True, cwd=repo_dir)
 
-        # Update remote: ensure it's fresh (remove then add)
-        subprocess.run(['git', 'remote', 'remove', 'gitlab_origin'], cwd=repo_dir, check=False)
-        subprocess.run(['git', 'remote', 'add', 'gitlab_origin', authenticated_repo_url], check=True, cwd=repo_dir)
-
-        # Stage binaries
-        for binary in binaries:
-            logger.info("Adding file: %s", binary)
-            subprocess.run(['git', 'add', binary], check=True, cwd=repo_dir)
-
-        # Skip commit if no changes are staged
-        status = subprocess.run(['git', 'diff', '--cached', '--quiet'], cwd=repo_dir)
-        if status.returncode == 0:
+        # Skip commit if no changes are staged; one status call reports both the staged
+        # changes and the current HEAD hash
+        status = subprocess.run(['git', 'status', '--porcelain=v2', '--branch', '--untracked-files=no'],
+                                check=True, cwd=repo_dir, capture_output=True, text=True)
+        commit_hash, has_staged = _parse_status(status.stdout)
+        if not has_staged:
             logger.info("No staged changes; skipping commit. Using current HEAD hash.")
         else:
-            subprocess.run(['git', 'commit', '-m', commit_message], check=True, cwd=repo_dir)
-
-        # Get current commit hash
-        result = subprocess.run(['git', 'rev-parse', 'HEAD'], check=True, cwd=repo_dir, capture_output=True, text=True)
-        commit_hash = result.stdout.strip()
+            commit_hash = None
+            # identity is passed inline instead of separate `git config` calls;
+            # core.abbrev=40 makes the "[branch <sha>] message" summary carry the full hash
+            result = subprocess.run(['git', *_GIT_IDENTITY, '-c', 'core.abbrev=40', 'commit', '-m', commit_message],
+                                    check=True, cwd=repo_dir, capture_output=True, text=True)
+            match = _COMMIT_SUMMARY_RE.match(result.stdout)
+            if match:
+                commit_hash = match.group(1)
+
+        # Fall back to rev-parse if the hash could not be taken from the status or commit output
+        if commit_hash is None:
+            result = subprocess.run(['git', 'rev-parse', 'HEAD'], check=True, cwd=repo_dir, capture_output=True, text=True)
+            commit_hash = result.stdout.strip()
         logger.info("Local commit hash: %s", commit_hash)
 
-        # Push to remote branch
-        subprocess.run(['git', 'push', 'gitlab_origin', f'HEAD:{branch}'], check=True, cwd=repo_dir)
-        logger.info("Pushed to %s:%s", 'gitlab_origin', branch)
+        # Push straight to the authenticated URL (no temporary remote to remove/add)
+        subprocess.run(['git', 'push', authenticated_repo_url, f'HEAD:{branch}'], check=True, cwd=repo_dir)
+        logger.info("Pushed to %s:%s", repo_url, branch)
 
         return commit_hash
 
@@ -139,6 +266,14 @@ class GitlabRep:
         project = self.get_project_obj()
 
         try:
+            # Every input is stored as CHANGELOG.md, so the last one wins (as with sequential
+            # updates); the others are only checked to exist, as they were when each was read
+            for file_path in files:
+                logger.info(f"Processing file: {file_path}")
+                if not os.path.isfile(file_path):
+                    raise FileNotFoundError(f"No such file: '{file_path}'")
+            content = _read_text(files[-1]) if files else None
+
             # Try to create branch if it doesn't exist
             try:
                 project.branches.create({
@@ -149,42 +284,26 @@ class GitlabRep:
             except gitlab.exceptions.GitlabCreateError:
                 logger.info(f"Branch {branch_name} already exists")
 
-            # Process each file
-            for file_path in files:
-                logger.info(f"Processing file: {file_path}")
+            if content is None:
+                # Nothing to commit: report the current head of the branch
+                commit_hash = project.branches.get(branch_name).commit['id']
+                logger.info(f"Latest commit hash in branch {branch_name}: {commit_hash}")
+                return commit_hash
 
-                # Read file content
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
+            # Determine if file exists and handle accordingly
+            try:
+                project.files.get(file_path='CHANGELOG.md', ref=branch_name)
+                action = 'update'
+            except gitlab.exceptions.GitlabGetError:
+                action = 'create'
 
-                file_name = 'CHANGELOG.md'
-                file_data = {
-                    'branch': branch_name,
-                    'commit_message': commit_message,
-                    'content': content,
-                }
-
-                # Determine if file exists and handle accordingly
-                file_exists = True
-                try:
-                    file_obj = project.files.get(file_path=file_name, ref=branch_name)
-                except gitlab.exceptions.GitlabGetError:
-                    file_exists = False
-
-                if not file_exists:
-                    # Create new file
-                    project.files.create(file_data | {'file_path': file_name})
-                    logger.info(f"Created file {file_name} in branch {branch_name}")
-                else:
-                    # Update existing file
-                    file_obj.content = content
-                    file_obj.save(branch=branch_name, commit_message=commit_message)
-                    logger.info(f"Updated file {file_name} in branch {branch_name}")
-
-            # Get the commit hash of the latest commit
-            branch = project.branches.get(branch_name)
-            commit_hash = branch.commit['id']
-            logger.info(f"Latest commit hash in branch {branch_name}: {commit_hash}")
+            commit = project.commits.create({
+                'branch': branch_name,
+                'commit_message': commit_message,
+                'actions': [{'action': action, 'file_path': 'CHANGELOG.md', 'content': content}],
+            })
+            commit_hash = commit.id
+            logger.info(f"Committed CHANGELOG.md to branch {branch_name}: {commit_hash}")
 
             return commit_hash
 
@@ -208,8 +327,7 @@ class GitlabRep:
         """
         Returns the project URL in GitLab.
         """
-        project = self.get_project_obj()
-        return f"{project.web_url}"
+        return self.get_project_obj().web_url
 
     def create_branch(self, branch_name: str) -> None:
         """
@@ -0,0 +1,12 @@
+import re
+from typing import Iterable
+
+# stdlib re on purpose: \w must keep matching non-ASCII markers such as [ЗАДАЧА-1]
+# (google-re2's \w is ASCII-only, which would change the extracted tasks)
+JIRA_TASK_PATTERN = re.compile(r'\[([\w\-]+)\]')
+_JIRA_SEARCH = JIRA_TASK_PATTERN.search
+
+
+def extract_jira_tasks(items: Iterable[str]) -> set[str]:
+    """Extract unique Jira task IDs from an iterable of strings (first task reference per item)."""
+    return {match.group(1) for match in map(_JIRA_SEARCH, items) if match}
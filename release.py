@@ -1,10 +1,12 @@
 import sys
 import os
 import re
+import functools
+import itertools
 import logging
-import sys
-import codecs
-from typing import NoReturn
+import shutil
+from typing import NamedTuple, NoReturn, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from .release_parser import ReleaseParser, ReleaseInfo, TargetInfo
@@ -13,33 +15,31 @@ from .generator_tag import GeneratorTag
 from .release_formatter import ReleaseFormatter
 from .changelog_generator import ChangelogGenerator
 from .firmware_store_pusher import FirmwareStorePusher
+from .jira_tasks import extract_jira_tasks
 
 GITLAB_URL = 'https://gitlab.neroelectronics.by/'
-JIRA_TASK_PATTERN = re.compile(r'\[([\w\-]+)\]')
 
 # ---------- logging ----------
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-# Set console encoding for proper Unicode output
-sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer)
+# Set console encoding for proper Unicode output: switch the existing stream to UTF-8 in place
+# instead of stacking a codecs writer on top of it
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding='utf-8')
 
 # ---------- validation helpers ----------
-_TAG_VRANGE_RE = re.compile(
-    r"^v"
-    r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]\d?)\."   # first group (project ID)
-    r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]\d?)\."   # second group (major version)
-    r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]\d?)\."   # third group (minor version)
-    r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]\d?)"     # fourth group (hardware number)
-    r"-Rev"
-    r"(25[0-5]|2[0-4]\d|1\d\d|[1-9]\d?)"     # revision number
-    r"(-release)?$"                          # optional release suffix
-)
+_BRANCH_RE = re.compile(r'^(?:release|hotfix)(?:/.*)?$')
+
+@functools.lru_cache(maxsize=None)
+def _allowed_targets(expected_targets_str: str) -> frozenset[str]:
+    # keyed by the raw value, so a changed EXPECTED_TARGETS is parsed again
+    return frozenset(t for t in map(str.strip, expected_targets_str.split(",")) if t)
 
 
 def validate_target(target_name: str) -> None:
     expected_targets_str = os.getenv('EXPECTED_TARGETS', "")
-    allowed = [t.strip() for t in expected_targets_str.split(",") if t.strip()]
+    allowed = _allowed_targets(expected_targets_str)
 
     if not allowed:
         raise ValueError(
@@ -47,20 +47,56 @@ def validate_target(target_name: str) -> None:
         )
 
     if target_name not in allowed:
-        raise ValueError(f"Target '{target_name}' is not in allowed list: {allowed}")
+        raise ValueError(f"Target '{target_name}' is not in allowed list: {sorted(allowed)}")
     logger.info("Target validation passed: %s", target_name)
 
 
 def validate_branch(info: ReleaseInfo) -> None:
     # Only release or hotfix branches are allowed (including sub-branches)
-    if not re.match(r'^(release|hotfix)(/.*)?$', info.branch_name):
+    if not _BRANCH_RE.match(info.branch_name):
         raise ValueError(
             f"Invalid branch: {info.branch_name}. Allowed branches must start with 'release' or 'hotfix'."
         )
     logger.info("Branch validation passed: %s", info.branch_name)
 
 
-def generate_release_email(info: ReleaseInfo, target: TargetInfo, rep: GitlabRep) -> str:
+class ReleaseNotes(NamedTuple):
+    features_text: str
+    bugfixes_text: str
+    tasks_text: str
+
+
+def release_notes(info: ReleaseInfo) -> ReleaseNotes:
+    """Email parts that depend only on the release, not on the target."""
+    # Collect all Jira tasks in one pass, without concatenating the lists
+    sorted_tasks = sorted(extract_jira_tasks(itertools.chain(info.features, info.bug_fixes)))
+
+    # Format features and bugfixes
+    features_text = "- отсутствуют" if not info.features else "\n".join(f"{item}" for item in info.features)
+    bugfixes_text = "- отсутствуют" if not info.bug_fixes else "\n".join(f"{item}" for item in info.bug_fixes)
+    return ReleaseNotes(features_text, bugfixes_text, ', '.join(sorted_tasks))
+
+
+class FwStoreSettings(NamedTuple):
+    repo_url: Optional[str]
+    token: Optional[str]
+    branch: str
+    project_id: str
+
+    @classmethod
+    def from_env(cls) -> "FwStoreSettings":
+        """Snapshot of the firmware store settings (FW_STORE_* / FW_PUSH_TOKEN)."""
+        return cls(
+            repo_url=os.getenv("FW_STORE_REPO_URL"),
+            token=os.getenv("FW_PUSH_TOKEN"),
+            branch=os.getenv("FW_STORE_BRANCH", "dev"),
+            project_id=os.getenv("FW_STORE_PROJECT_ID", "0"),
+        )
+
+
+def generate_release_email(info: ReleaseInfo, target: TargetInfo, rep: GitlabRep,
+                           notes: Optional[ReleaseNotes] = None,
+                           fw_store: Optional[FwStoreSettings] = None) -> str:
     """
     Generate release email text with all necessary information and links.
     
@@ -68,23 +104,19 @@ def generate_release_email(info: ReleaseInfo, target: TargetInfo, rep: GitlabRep
         info: Release information object
         target: Target information object
         rep: GitLab repository object
+        notes: Precomputed release_notes(info), to share between targets
+        fw_store: Firmware store settings; read from the environment if not given
     
     Returns:
         Formatted email text
     """
     # Extract product name from target name
-    product_name = target.target_name.split('_hard')[0].upper()
-    
-    # Collect all Jira tasks
-    all_tasks = set()
-    for item in info.features + info.bug_fixes:
-        match = JIRA_TASK_PATTERN.search(item)
-        if match:
-            all_tasks.add(match.group(1))
+    product_name = target.product_name
     
-    # Format features and bugfixes
-    features_text = "- отсутствуют" if not info.features else "\n".join(f"{item}" for item in info.features)
-    bugfixes_text = "- отсутствуют" if not info.bug_fixes else "\n".join(f"{item}" for item in info.bug_fixes)
+    if notes is None:
+        notes = release_notes(info)
+    if fw_store is None:
+        fw_store = FwStoreSettings.from_env()
     
     # Get repository URL
     repo_url = rep.get_project_url()
@@ -95,12 +127,12 @@ def generate_release_email(info: ReleaseInfo, target: TargetInfo, rep: GitlabRep
 
     # Determine tag name: if upgrading to release, append '-release' to base tag.
     # Otherwise, use base tag name.
-    tag_name = target.tag_name + "-release" if info.upgrade_to_release else target.tag_name
+    tag_name = target.release_tag_name if info.upgrade_to_release else target.tag_name
 
     # Generate email text
     # Prefer firmware storage repo for direct links to binaries/containers when configured
-    fw_repo = os.getenv("FW_STORE_REPO_URL", "").rstrip('.git')
-    fw_branch = os.getenv("FW_STORE_BRANCH", "dev")
+    fw_repo = (fw_store.repo_url or "").rstrip('.git')
+    fw_branch = fw_store.branch
     if fw_repo:
         bin_link = f"{fw_repo}/-/blob/{fw_branch}/{tag_name}/{target.target_name}.bin"
         container_link = f"{fw_repo}/-/blob/{fw_branch}/{tag_name}/{target.container_name}"
@@ -120,9 +152,9 @@ def generate_release_email(info: ReleaseInfo, target: TargetInfo, rep: GitlabRep
     email_text = f"""{intro_phrase}. {product_name} {tag_name}.
 
 New Features:
-{features_text}
+{notes.features_text}
 Bug Fixes:
-{bugfixes_text}
+{notes.bugfixes_text}
 
 Прошивка передается из ветки {branch_type}.
 
@@ -136,38 +168,85 @@ Bug Fixes:
 {container_link}
 
 Задачи в рамках которых делалась прошивка:
-{', '.join(sorted(all_tasks))}
+{notes.tasks_text}
 """
     return email_text
 
+class TargetPaths(NamedTuple):
+    bin: str
+    map: str
+    container: str
+
+
+def target_paths(build_dir: str, target: TargetInfo) -> TargetPaths:
+    """Paths of the build outputs of a target: firmware binary, map file and container."""
+    return TargetPaths(
+        bin=os.path.join(build_dir, f"{target.target_name}.bin"),
+        map=os.path.join(build_dir, f"{target.target_name}.map"),
+        container=os.path.join(build_dir, target.container_name),
+    )
+
 def collect_target_files(build_dir: str, targets: list[TargetInfo]) -> list[str]:
-    files = []
-    for t in targets:
-        files.extend([
-            os.path.join(build_dir, f"{t.target_name}.bin"),
-            os.path.join(build_dir, f"{t.target_name}.map"),
-            os.path.join(build_dir, t.container_name),
-        ])
-    # keep only existing files
-    files = [p for p in files if os.path.exists(p)]
-    return files
+    # keep only existing files: one directory listing instead of a stat() per candidate
+    # (DirEntry.path is os.path.join(build_dir, name), same as target_paths)
+    try:
+        with os.scandir(build_dir) as it:
+            present = {e.path for e in it}
+    except FileNotFoundError:
+        return []
+
+    return [p for t in targets for p in target_paths(build_dir, t) if p in present]
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link src to dst (no data copy); fall back to a regular copy across filesystems."""
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+def push_targets_to_store(pusher: Optional[FirmwareStorePusher], info: ReleaseInfo, build_dir: str,
+                          release: bool, url_set: bool) -> None:
+    """
+    Publish each target's files to the firmware store under <tag_name>/ (<tag_name>-release/ for a release).
+    All targets go out with a single push; a failed target is logged and doesn't stop the others.
+    """
+    releases = []
+    for target in info.targets:
+        release_tag = target.release_tag_name if release else target.tag_name  # folder = this tag
+        # collect only files for this target
+        files_to_push = collect_target_files(build_dir, [target])
+
+        if files_to_push and pusher:
+            releases.append((release_tag, files_to_push))
+        else:
+            logger.warning(
+                "Skip publish for tag %s (no files or credentials). Files: %d, URL set: %s",
+                release_tag, len(files_to_push), url_set
+            )
+
+    if releases:
+        try:
+            pusher.push_releases(info, releases)
+        except Exception as e:
+            logger.error("Publish to firmware store failed for tags %s: %s",
+                         ", ".join(tag for tag, _ in releases), e)
 
 def validate_tag(tag_name: str, rep: GitlabRep) -> None:
-    # 1) Check format and value ranges
-    if not _TAG_VRANGE_RE.match(tag_name):
+    # 1) Check format and value ranges (single canonical validator)
+    if not ReleaseFormatter.validate_tag_string(tag_name):
         raise ValueError(
             f"Invalid tag format: {tag_name}, "
             f"expected vXX.XX.XX.XX-RevXX[-release] where XX in 1..255"
         )
-    # Additional validation using the common formatter
-    if not ReleaseFormatter.validate_tag_string(tag_name):
-        raise ValueError(f"Tag does not match canonical pattern: {tag_name}")
 
-    # 2) Check if tag exists in GitLab
-    existing_url = rep.get_tag(tag_name)   # returns URL or None
-    if existing_url is not None:
+    # 2) Check if tag exists in GitLab (HEAD request; the URL is then served from cache)
+    if rep.tag_exists(tag_name):
         # Tag already exists, meaning release was already created
-        raise RuntimeError(f"Tag '{tag_name}' already exists: {existing_url}")
+        raise RuntimeError(f"Tag '{tag_name}' already exists: {rep.get_tag(tag_name)}")
 
     logger.info("Tag validation passed and tag doesn't exist yet: %s", tag_name)
 
@@ -186,6 +265,7 @@ def main() -> NoReturn:
 
     # 1. Parse configuration files
     info = ReleaseParser(release_json_path, defs_path).parse()
+    fw_store = FwStoreSettings.from_env()
 
     # 2. Initialize repository and perform basic validations
     build_dir = 'build'
@@ -194,69 +274,76 @@ def main() -> NoReturn:
 
     # 3. Process each target combination
     all_binaries = []
-    for target in info.targets:
-        logger.info("Processing target: %s", target.target_name)
 
-        if info.upgrade_to_release:
-            # For upgrade_to_release mode: verify beta-tag exists and create release-tag
+    # Existence of all tags involved is resolved with one listing instead of a request per tag
+    tag_names = [target.tag_name for target in info.targets]
+    if info.upgrade_to_release:
+        tag_names += [target.release_tag_name for target in info.targets]
+    rep.prefetch_tags(tag_names)
+
+    if info.upgrade_to_release:
+        # For upgrade_to_release mode: verify all beta-tags exist before any release-tag is created
+        # (the lookups are answered from the prefetched cache)
+        release_tags = []
+        for target in info.targets:
+            logger.info("Processing target: %s", target.target_name)
             beta_tag = target.tag_name
-            release_tag = beta_tag + "-release"
+            release_tag = target.release_tag_name
             validate_tag(release_tag, rep)
 
-            existing_url = rep.get_tag(beta_tag)
-            if existing_url is None:
+            # get_tag fetches the tag object, so the commit lookup below is answered from cache
+            if rep.get_tag(beta_tag) is None:
                 raise ValueError(f"Beta tag '{beta_tag}' not found")
 
             # Get commit hash from beta-tag
-            commit_hash = rep.get_tag_commit_hash(beta_tag)
+            release_tags.append((release_tag, rep.get_tag_commit_hash(beta_tag)))
 
+        def create_release_tag(tag_commit: tuple[str, str]) -> None:
             # Create release-tag on the same commit
+            release_tag, commit_hash = tag_commit
             GeneratorTag(rep, release_tag, info.features, info.bug_fixes, commit_hash).generate()
-            continue
-
-        # Validate target and tag for normal mode
-        validate_target(target.target_name)
-        validate_tag(target.tag_name, rep)
-
-        # 4. Build for current target
-        temp_info = ReleaseInfo(
-            git_project_id=info.git_project_id,
-            branch_name=info.branch_name,
-            is_service_firmware=info.is_service_firmware,
-            upgrade_to_release=info.upgrade_to_release,
-            features=info.features,
-            bug_fixes=info.bug_fixes,
-            targets=[target]  # only the current target
-            )
 
-        build_rep = GitlabRep(GITLAB_URL, info.git_project_id, token, temp_info, build_dir)
-        build_rep.build_project()
+        # Each release-tag only touches its own tag, so the GitLab round-trips run concurrently;
+        # list() re-raises the first failure
+        with ThreadPoolExecutor(max_workers=min(8, len(info.targets))) as ex:
+            list(ex.map(create_release_tag, release_tags))
+    else:
+        # Validate all targets and tags before anything is built
+        for target in info.targets:
+            logger.info("Processing target: %s", target.target_name)
+            validate_target(target.target_name)
+            validate_tag(target.tag_name, rep)
+
+        # 4. Build all targets with one configure and one build invocation: Ninja schedules the
+        #    targets' independent steps in parallel (the targets share one build directory, so
+        #    separate per-target cmake runs can't be overlapped safely)
+        rep.build_project()
 
         # Add binaries to the common list
-        bin_name = os.path.join(build_dir, f"{target.target_name}.bin")
-        map_name = os.path.join(build_dir, f"{target.target_name}.map")
-        container_name = os.path.join(build_dir, target.container_name)
-        all_binaries.extend([bin_name, map_name, container_name])
+        for target in info.targets:
+            all_binaries.extend(target_paths(build_dir, target))
 
     # 5*. Update changelog, generate email texts and push release binaries to 
     #     a firmware storage repository
     if info.upgrade_to_release:
         # 5.1 Update changelog
         # Create a new branch name for changelog update
-        new_branch = f"feature/changelog-update-{info.targets[0].tag_name}-release"
+        new_branch = f"feature/changelog-update-{info.targets[0].release_tag_name}"
 
         # Commit message for changelog changes
         commit_message = f"docs(changelog): update for release {info.targets[0].tag_name}"
 
         # Update CHANGELOG.md
-        ChangelogGenerator().update_changelog_and_push(info, rep, new_branch, commit_message)
+        changelog = ChangelogGenerator()
+        changelog.update_changelog_and_push(info, rep, new_branch, commit_message)
 
         # 5.2 Generate release email and save to file
         artifacts_dir = os.path.join(build_dir, 'artifacts')
         os.makedirs(artifacts_dir, exist_ok=True)
+        notes = release_notes(info)
         for target in info.targets:
-            email_text = generate_release_email(info, target, rep)
-            email_file = os.path.join(artifacts_dir, f"release_email_{target.tag_name}-release.txt")
+            email_text = generate_release_email(info, target, rep, notes, fw_store)
+            email_file = os.path.join(artifacts_dir, f"release_email_{target.release_tag_name}.txt")
             with open(email_file, "w", encoding="utf-8") as f:
                 f.write(email_text)
             logger.info(f"Generated release email: {email_file}")
@@ -265,10 +352,10 @@ def main() -> NoReturn:
 
         # 5.3 push release binaries to a firmware storage repository
         try:
-            fw_repo_url   = os.getenv("FW_STORE_REPO_URL")
-            fw_token      = os.getenv("FW_PUSH_TOKEN")
-            fw_branch     = os.getenv("FW_STORE_BRANCH", "dev")
-            fw_project_id = int(os.getenv("FW_STORE_PROJECT_ID", "0"))
+            fw_repo_url   = fw_store.repo_url
+            fw_token      = fw_store.token
+            fw_branch     = fw_store.branch
+            fw_project_id = int(fw_store.project_id)
 
             if not info.targets:
                 logger.warning("No targets found for publishing to firmware store")
@@ -279,26 +366,13 @@ def main() -> NoReturn:
                     if fw_repo_url and fw_token:
                         pusher = FirmwareStorePusher(fw_repo_url, fw_token, fw_branch)
 
-                    for target in info.targets:
-                        release_tag = target.tag_name + "-release"  # folder = this tag
-                        # collect only files for this target
-                        files_to_push = collect_target_files(build_dir, [target])
-
-                        if files_to_push and pusher:
-                            try:
-                                pusher.push_release(info, tag_name=release_tag, src_paths=files_to_push)
-                            except Exception as e:
-                                logger.error("Publish to firmware store failed for tag %s: %s", release_tag, e)
-                        else:
-                            logger.warning(
-                                "Skip publish for tag %s (no files or credentials). Files: %d, URL set: %s",
-                                release_tag, len(files_to_push), bool(fw_repo_url)
-                            )
+                    push_targets_to_store(pusher, info, build_dir, True, bool(fw_repo_url))
 
                     if fw_token and fw_project_id:
-                        branch_for_changelog_upd = f"feature/changelog-update-{info.targets[0].tag_name}-release"
-                        rep = GitlabRep(GITLAB_URL, fw_project_id, fw_token, info, build_dir)
-                        ChangelogGenerator().update_changelog_and_push(info, rep, branch_for_changelog_upd, commit_message="docs: update changelog for new release")
+                        branch_for_changelog_upd = f"feature/changelog-update-{info.targets[0].release_tag_name}"
+                        # same GitLab server: reuse the HTTP session of the main repository
+                        fw_rep = rep.for_project(fw_project_id, fw_token)
+                        changelog.update_changelog_and_push(info, fw_rep, branch_for_changelog_upd, commit_message="docs: update changelog for new release")
                 finally:
                     if pusher:
                         pusher.close()
@@ -318,33 +392,40 @@ def main() -> NoReturn:
     # 6. Create tags for each target, generate release emails and push binaries to firmware storage repo
     artifacts_dir = os.path.join(build_dir, 'artifacts')
     os.makedirs(artifacts_dir, exist_ok=True)
+    # one listing of the build directory instead of an exists() check per binary
+    built_files = set(collect_target_files(build_dir, info.targets))
+    notes = release_notes(info)
 
-    for target in info.targets:
+    def publish_target(target: TargetInfo) -> None:
         GeneratorTag(rep, target.tag_name, info.features, info.bug_fixes, release_commit_hash).generate()
 
         # 6.1 Generate release email and save to file
-        email_text = generate_release_email(info, target, rep)
+        email_text = generate_release_email(info, target, rep, notes, fw_store)
         email_file = os.path.join(artifacts_dir, f"release_email_{target.tag_name}.txt")
         with open(email_file, "w", encoding="utf-8") as f:
             f.write(email_text)
         logger.info(f"Generated release email: {email_file}")
 
         # 6.2 Copy binaries to artifacts directory
-        for binary in [f"{target.target_name}.bin", f"{target.target_name}.map", target.container_name]:
-            src = os.path.join(build_dir, binary)
+        for src in target_paths(build_dir, target):
+            binary = os.path.basename(src)
             dst = os.path.join(artifacts_dir, binary)
-            if os.path.exists(src):
-                import shutil
-                shutil.copy2(src, dst)
+            if src in built_files:
+                _link_or_copy(src, dst)
                 logger.info(f"Copied {binary} to artifacts directory")
 
+    # Targets are independent and dominated by GitLab API latency, so they are published concurrently
+    # (the build above has finished by now); list() re-raises the first failure
+    with ThreadPoolExecutor(max_workers=min(8, len(info.targets))) as ex:
+        list(ex.map(publish_target, info.targets))
+
     logger.info(f"All release artifacts are saved in: {artifacts_dir}")
 
     # 6.3 push release binaries to a firmware storage repository
     try:
-        fw_repo_url   = os.getenv("FW_STORE_REPO_URL")
-        fw_token      = os.getenv("FW_PUSH_TOKEN")
-        fw_branch     = os.getenv("FW_STORE_BRANCH", "dev")
+        fw_repo_url   = fw_store.repo_url
+        fw_token      = fw_store.token
+        fw_branch     = fw_store.branch
 
         if not info.targets:
             logger.warning("No targets found for publishing to firmware store")
@@ -355,21 +436,7 @@ def main() -> NoReturn:
                 if fw_repo_url and fw_token:
                     pusher = FirmwareStorePusher(fw_repo_url, fw_token, fw_branch)
 
-                for target in info.targets:
-                    release_tag = target.tag_name  # folder = this tag
-                    # collect only files for this target
-                    files_to_push = collect_target_files(build_dir, [target])
-
-                    if files_to_push and pusher:
-                        try:
-                            pusher.push_release(info, tag_name=release_tag, src_paths=files_to_push)
-                        except Exception as e:
-                            logger.error("Publish to firmware store failed for tag %s: %s", release_tag, e)
-                    else:
-                        logger.warning(
-                            "Skip publish for tag %s (no files or credentials). Files: %d, URL set: %s",
-                            release_tag, len(files_to_push), bool(fw_repo_url)
-                        )
+                push_targets_to_store(pusher, info, build_dir, False, bool(fw_repo_url))
             finally:
                 if pusher:
                     pusher.close()
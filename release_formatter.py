@@ -1,13 +1,22 @@
+import functools
 import re
 from typing import Dict
 
+# vP.M.N.H-RevR[-release]; each number is 1..255 without leading zeros (upper bound checked in code)
+_TAG_NUM = r"([1-9]\d{0,2})"
 _TAG_RE = re.compile(
-    r"^v(\d+)\.(\d+)\.(\d+)\.(\d+)-Rev(\d+)(-release)?$"
+    rf"v{_TAG_NUM}\.{_TAG_NUM}\.{_TAG_NUM}\.{_TAG_NUM}-Rev{_TAG_NUM}(-release)?",
+    re.ASCII,
 )
+TAG_NUM_MAX = 255
 
 def _calc_minor(variant_num: int, minor_ver: int) -> int:
-    # ((variant_num - 1) << 4) | minor_ver
-    return ((variant_num - 1) << 4) | minor_ver
+    # ((variant_num - 1) << 4) | minor_ver; variant 16 shares the upper nibble of variant 15
+    if not 1 <= variant_num <= 16:
+        raise ValueError(f"Variant number must be between 1 and 16 (inclusive), got {variant_num}")
+    if not 1 <= minor_ver <= 15:
+        raise ValueError(f"Minor version must be between 1 and 15 (inclusive), got {minor_ver}")
+    return ((min(variant_num, 15) - 1) << 4) | minor_ver
 
 class ReleaseFormatter:
     """
@@ -16,36 +25,48 @@ class ReleaseFormatter:
     """
 
     @staticmethod
-    def make_tag_name_from_dict(json_data: Dict, defs_data: Dict) -> str:
-        proj_id      = int(defs_data["proj_id"])
-        major_ver    = int(defs_data["major_ver"])
-        minor_ver    = int(defs_data["minor_ver"])
-        hard_num     = int(json_data["hard_num"])
-        variant_num  = int(json_data["variant_num"])
-
-         # generate revision_ver
-        is_service_firmware=json_data.get("is_service_firmware", False)
+    @functools.lru_cache(maxsize=512)
+    def make_tag_name(proj_id: int, major_ver: int, minor_ver: int, hard_num: int, variant_num: int,
+                      is_service_firmware: bool, revision_ver: int) -> str:
+        # service firmware always has Rev255
         if is_service_firmware:
             revision_ver = 255
-        else:
-            revision_ver = int(defs_data["revision_ver"])
 
         minor = _calc_minor(variant_num, minor_ver)
-        tag = f"v{proj_id}.{major_ver}.{minor}.{hard_num}-Rev{revision_ver}"
-
-        return tag
+        return f"v{proj_id}.{major_ver}.{minor}.{hard_num}-Rev{revision_ver}"
 
     @staticmethod
-    def make_container_name_from_dict(json_data: Dict, defs_data: Dict) -> str:
-        proj_id     = int(defs_data["proj_id"])
-        major_ver   = int(defs_data["major_ver"])
-        minor_ver   = int(defs_data["minor_ver"])
-        hard_num    = int(json_data["hard_num"])
-        variant_num = int(json_data["variant_num"])
-
+    @functools.lru_cache(maxsize=512)
+    def make_container_name(proj_id: int, major_ver: int, minor_ver: int, hard_num: int, variant_num: int) -> str:
         minor = _calc_minor(variant_num, minor_ver)
         return f"{proj_id}.{major_ver:03d}.{minor:03d}.{hard_num:03d}.btl.bin"
 
     @staticmethod
+    def make_tag_name_from_dict(json_data: Dict, defs_data: Dict) -> str:
+        is_service_firmware = bool(json_data.get("is_service_firmware", False))
+        return ReleaseFormatter.make_tag_name(
+            int(defs_data["proj_id"]),
+            int(defs_data["major_ver"]),
+            int(defs_data["minor_ver"]),
+            int(json_data["hard_num"]),
+            int(json_data["variant_num"]),
+            is_service_firmware,
+            # revision_ver isn't needed (nor required) for service firmware
+            255 if is_service_firmware else int(defs_data["revision_ver"]),
+        )
+
+    @staticmethod
+    def make_container_name_from_dict(json_data: Dict, defs_data: Dict) -> str:
+        return ReleaseFormatter.make_container_name(
+            int(defs_data["proj_id"]),
+            int(defs_data["major_ver"]),
+            int(defs_data["minor_ver"]),
+            int(json_data["hard_num"]),
+            int(json_data["variant_num"]),
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=512)
     def validate_tag_string(tag: str) -> bool:
-        return bool(_TAG_RE.match(tag))
+        m = _TAG_RE.fullmatch(tag)
+        return m is not None and all(int(num) <= TAG_NUM_MAX for num in m.groups()[:5])
@@ -5,9 +5,20 @@ from dataclasses import dataclass
 from typing import List, Dict
 from .release_formatter import ReleaseFormatter
 
+try:
+    # Optional: orjson parses in C; its JSONDecodeError subclasses json.JSONDecodeError
+    import orjson
+except ImportError:
+    orjson = None
+
 MIN_MINOR_VERSION = 1
 MAX_MINOR_VERSION = 15
 
+# Captures variants with #define NAME (123) as well
+_DEFINE_RE = re.compile(
+    rb"#define\s+(PRODUCT_ID|PRODUCT_VERSION|PRODUCT_VARIANT_MINOR_VER|PRODUCT_REVISION)\s+\(?(\d+)\)?"
+)
+
 @dataclass
 class TargetInfo:
     target_name: str
@@ -16,6 +27,16 @@ class TargetInfo:
     hard_num: int
     variant_num: int
 
+    @property
+    def release_tag_name(self) -> str:
+        """Tag of the customer release built from this (beta) tag."""
+        return f"{self.tag_name}-release"
+
+    @property
+    def product_name(self) -> str:
+        """Product name as shown in release emails: target name without the hardware/variant suffix."""
+        return self.target_name.split('_hard')[0].upper()
+
 @dataclass
 class ReleaseInfo:
     git_project_id: int
@@ -25,6 +46,7 @@ class ReleaseInfo:
     features: List[str]
     bug_fixes: List[str]
     targets: List[TargetInfo]
+    force_clean: bool = False
 
 class ReleaseParser:
     """
@@ -37,8 +59,11 @@ class ReleaseParser:
         self._defs_file_path = defs_file_path
 
     def parse(self) -> ReleaseInfo:
-        with open(self._json_file_path, encoding="utf-8") as f:
-            json_data = json.load(f)
+        if orjson is not None:
+            json_data = orjson.loads(Path(self._json_file_path).read_bytes())
+        else:
+            with open(self._json_file_path, encoding="utf-8") as f:
+                json_data = json.load(f)
 
         # Required JSON fields
         required = ['cmake_project_name', 'git_project_id', 'branch_name', 'targets']
@@ -52,26 +77,36 @@ class ReleaseParser:
         # defs.h
         defs_data = self.parse_defs(self._defs_file_path)
 
+        # Version numbers shared by all targets are converted once
+        proj_id = int(defs_data["proj_id"])
+        major_ver = int(defs_data["major_ver"])
+        minor_ver = int(defs_data["minor_ver"])
+        revision_ver = int(defs_data["revision_ver"])
+        is_service_firmware = json_data.get("is_service_firmware", False)
+
         # Create TargetInfo objects for each hard_num/variant_num combination
         targets = []
         for target in json_data['targets']:
             if 'hard_num' not in target or 'variant_num' not in target:
                 raise ValueError("Each target must have 'hard_num' and 'variant_num'")
 
-            # Create a copy of json_data for each target, updating hard_num and variant_num
-            target_json = json_data.copy()
-            target_json.update(target)
+            hard_num = int(target['hard_num'])
+            variant_num = int(target['variant_num'])
+            # a target entry may override the release-wide service flag
+            target_is_service = bool(target.get("is_service_firmware", is_service_firmware))
 
             target_name = f"{json_data['cmake_project_name']}_hard{target['hard_num']}_var{target['variant_num']}"
-            tag_name = ReleaseFormatter.make_tag_name_from_dict(target_json, defs_data)
-            container_name = ReleaseFormatter.make_container_name_from_dict(target_json, defs_data)
+            tag_name = ReleaseFormatter.make_tag_name(
+                proj_id, major_ver, minor_ver, hard_num, variant_num, target_is_service, revision_ver
+            )
+            container_name = ReleaseFormatter.make_container_name(proj_id, major_ver, minor_ver, hard_num, variant_num)
 
             targets.append(TargetInfo(
                 target_name=target_name,
                 tag_name=tag_name,
                 container_name=container_name,
-                hard_num=int(target['hard_num']),
-                variant_num=int(target['variant_num'])
+                hard_num=hard_num,
+                variant_num=variant_num
             ))
 
         return ReleaseInfo(
@@ -81,20 +116,24 @@ class ReleaseParser:
             upgrade_to_release=bool(json_data.get("upgrade_to_release", False)),
             features=list(json_data.get("features", [])),
             bug_fixes=list(json_data.get("bug_fixes", [])),
-            targets=targets
+            targets=targets,
+            force_clean=bool(json_data.get("force_clean", False))
         )
 
     def parse_defs(self, defs_path: str) -> Dict[str, int]:
         """Parses defs.h and returns a dictionary of versions"""
-        text = Path(defs_path).read_text(encoding="utf-8")
+        # The defines are plain ASCII, so the header is scanned as bytes without decoding it
+        data = Path(defs_path).read_bytes()
+
+        # One scan for all defines; the first definition of each name wins
+        found: Dict[str, int] = {}
+        for m in _DEFINE_RE.finditer(data):
+            found.setdefault(m.group(1).decode("ascii"), int(m.group(2)))
 
         def get_define(name: str) -> int:
-            # Captures variants with #define NAME (123) as well
-            pattern = rf"#define\s+{name}\s+\(?(\d+)\)?"
-            m = re.search(pattern, text)
-            if not m:
+            if name not in found:
                 raise ValueError(f"Define '{name}' not found in text")
-            return int(m.group(1))
+            return found[name]
 
         versions = {
             "proj_id": get_define("PRODUCT_ID"),
@@ -0,0 +1,31 @@
+import pytest
+
+# Shared, read-only test data: session scope builds each dict once for the whole run
+
+
+@pytest.fixture(scope="session")
+def json_data():
+    return {
+        "hard_num": 1,
+        "variant_num": 2,
+        "is_service_firmware": False
+    }
+
+
+@pytest.fixture(scope="session")
+def service_json_data():
+    return {
+        "hard_num": 1,
+        "variant_num": 2,
+        "is_service_firmware": True
+    }
+
+
+@pytest.fixture(scope="session")
+def defs_data():
+    return {
+        "proj_id": 1,
+        "major_ver": 2,
+        "minor_ver": 3,
+        "revision_ver": 4
+    }
@@ -0,0 +1,13 @@
+import pytest
+from ..changelog_generator import _find_title_end
+
+
+@pytest.mark.parametrize("content, expected", [
+    pytest.param("# Changelog\n## v1\n", len("# Changelog\n"), id="first_line"),
+    pytest.param("<!-- notes -->\n# Changelog\n## v1\n", len("<!-- notes -->\n# Changelog\n"), id="further_down"),
+    pytest.param("<!-- notes -->\n# Changelog", len("<!-- notes -->\n# Changelog"), id="no_trailing_newline"),
+    pytest.param("## v1\n- fix\n", -1, id="no_title"),
+])
+def test_find_title_end(content, expected):
+    """Test locating the end of the changelog title line"""
+    assert _find_title_end(content) == expected
@@ -0,0 +1,73 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+from ..firmware_store_pusher import FirmwareStorePusher
+from ..release_parser import ReleaseInfo
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def git(*args, cwd=None):
+    return subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Local bare store repository with one seed commit on 'main'"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    bare = tmp_path / "store.git"
+    git("init", "-q", "--bare", "-b", "main", str(bare))
+    # the pusher makes a partial clone
+    git("config", "uploadpack.allowFilter", "true", cwd=bare)
+    seed = tmp_path / "seed"
+    git("clone", "-q", str(bare), str(seed))
+    (seed / "README.md").write_text("store\n")
+    git("add", "-A", cwd=seed)
+    git("-c", "user.name=seed", "-c", "user.email=seed@example.com", "commit", "-qm", "seed", cwd=seed)
+    git("push", "-q", "origin", "HEAD:main", cwd=seed)
+    return bare
+
+
+def test_push_releases_skips_failed_tag(store, tmp_path, monkeypatch):
+    """A tag that fails to prepare is reset and skipped; the others go out in a single push"""
+    binary = tmp_path / "fw.bin"
+    binary.write_bytes(b"\x00\x01firmware")
+    info = ReleaseInfo(1, "release", False, False, ["[AB-1] feature"], [], [])
+
+    prepare_tag_dir = FirmwareStorePusher._prepare_tag_dir
+
+    def prepare_or_fail(self, tmp, tag_name, src_paths):
+        if tag_name == "v1.2.3.2-Rev4":
+            # leave a half-written folder behind
+            os.makedirs(os.path.join(tmp, tag_name), exist_ok=True)
+            with open(os.path.join(tmp, tag_name, "partial.bin"), "wb") as f:
+                f.write(b"partial")
+            raise OSError("disk full")
+        prepare_tag_dir(self, tmp, tag_name, src_paths)
+
+    calls = []
+    run = subprocess.run
+
+    def record_run(args, *rest, **kwargs):
+        calls.append(list(args))
+        return run(args, *rest, **kwargs)
+
+    monkeypatch.setattr(FirmwareStorePusher, "_prepare_tag_dir", prepare_or_fail)
+    monkeypatch.setattr(subprocess, "run", record_run)
+
+    pusher = FirmwareStorePusher(f"file://{store}", "token", "main")
+    try:
+        pusher.push_releases(info, [(tag, [str(binary)]) for tag in ("v1.2.3.1-Rev4", "v1.2.3.2-Rev4", "v1.2.3.3-Rev4")])
+    finally:
+        pusher.close()
+
+    assert ["git", "reset", "-q", "--", "v1.2.3.2-Rev4"] in calls
+    assert sum(1 for args in calls if args[:2] == ["git", "push"]) == 1
+    log = git("log", "--format=%s", "main", cwd=store).splitlines()
+    assert log == ["Add release binaries for v1.2.3.3-Rev4", "Add release binaries for v1.2.3.1-Rev4", "seed"]
+    files = git("ls-tree", "-r", "--name-only", "main", cwd=store).splitlines()
+    assert "v1.2.3.1-Rev4/fw.bin" in files and "v1.2.3.3-Rev4/fw.bin" in files
+    assert not any(name.startswith("v1.2.3.2-Rev4/") for name in files)
@@ -0,0 +1,86 @@
+import subprocess
+from unittest.mock import Mock
+
+import pytest
+from ..gitlab_rep import GitlabRep, _COMMIT_SUMMARY_RE, _parse_status
+
+HEAD = "0123456789abcdef0123456789abcdef01234567"
+BLOB = "89abcdef0123456789abcdef0123456789abcdef"
+
+
+@pytest.mark.parametrize("status, expected", [
+    pytest.param(
+        f"# branch.oid {HEAD}\n# branch.head main\n"
+        f"1 M. N... 100644 100644 100644 {BLOB} {BLOB} bin/fw.bin\n",
+        (HEAD, True), id="staged"),
+    pytest.param(
+        f"# branch.oid {HEAD}\n# branch.head main\n"
+        f"1 .M N... 100644 100644 100644 {BLOB} {BLOB} bin/fw.bin\n? notes.txt\n",
+        (HEAD, False), id="unstaged_only"),
+    pytest.param(
+        "# branch.oid (initial)\n# branch.head main\n"
+        f"1 A. N... 000000 100644 100644 {'0' * 40} {BLOB} bin/fw.bin\n",
+        (None, True), id="initial"),
+    pytest.param(
+        f"# branch.oid {HEAD}\n# branch.head main\n"
+        f"2 R. N... 100644 100644 100644 {BLOB} {BLOB} R100 bin/new.bin\tbin/old.bin\n",
+        (HEAD, True), id="rename"),
+    pytest.param(
+        f"# branch.oid {HEAD}\n# branch.head (detached)\n",
+        (HEAD, False), id="detached_head"),
+])
+def test_parse_status(status, expected):
+    """Test porcelain v2 status parsing: HEAD hash and staged changes"""
+    assert _parse_status(status) == expected
+
+
+@pytest.mark.parametrize("output", [
+    pytest.param(f"[main {HEAD}] Add firmware\n 1 file changed\n", id="normal"),
+    pytest.param(f"[main (root-commit) {HEAD}] Add firmware\n 1 file changed\n", id="root_commit"),
+])
+def test_commit_summary_hash(output):
+    """Test taking the full commit hash from the `git commit` summary line"""
+    match = _COMMIT_SUMMARY_RE.match(output)
+    assert match and match.group(1) == HEAD
+
+
+def test_commit_summary_fallback_to_rev_parse(monkeypatch):
+    """An unrecognised `git commit` summary falls back to `git rev-parse HEAD`"""
+    outputs = {
+        "status": f"# branch.oid {HEAD}\n1 M. N... 100644 100644 100644 {BLOB} {BLOB} fw.bin\n",
+        "commit": "[main abc1234] Add firmware\n",
+        "rev-parse": f"{BLOB}\n",
+    }
+    calls = []
+
+    def run(args, **kwargs):
+        calls.append(args)
+        command = next((arg for arg in args if arg in outputs), None)
+        return subprocess.CompletedProcess(args, 0, stdout=outputs.get(command, ""), stderr="")
+
+    monkeypatch.setattr(subprocess, "run", run)
+    rep = GitlabRep("https://gitlab.example", 1, "token", None, "build")
+    rep._project = Mock(http_url_to_repo="https://gitlab.example/fw/store.git")
+
+    assert rep.commit_and_push_binaries("repo", "main", ["fw.bin"], "Add firmware") == BLOB
+    assert ["git", "rev-parse", "HEAD"] in calls
+    assert calls[-1][:2] == ["git", "push"]
+
+
+def test_prefetch_tags_caches_hits_and_misses():
+    """Listed tags are cached as present, the other requested names as absent"""
+    tag = Mock(commit={"id": HEAD})
+    tag.name = "v1.2.3.4-Rev5"
+    project = Mock(web_url="https://gitlab.example/fw/app")
+    project.tags.list.return_value = [tag]
+    rep = GitlabRep("https://gitlab.example", 1, "token", None, "build")
+    rep._project = project
+
+    rep.prefetch_tags(["v1.2.3.4-Rev5", "v1.2.3.4-Rev6"])
+
+    project.tags.list.assert_called_once_with(search="^v1.2.3.4-Rev", per_page=100, iterator=True)
+    assert rep.tag_exists("v1.2.3.4-Rev5")
+    assert rep.get_tag_commit_hash("v1.2.3.4-Rev5") == HEAD
+    assert not rep.tag_exists("v1.2.3.4-Rev6")
+    assert rep.get_tag("v1.2.3.4-Rev6") is None
+    project.tags.get.assert_not_called()
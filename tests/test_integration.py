@@ -1,9 +1,11 @@
 # import os
-# import unittest
-# from unittest.mock import Mock, patch
-# import tempfile
 # import json
-# from pathlib import Path
+# import shutil
+# import subprocess
+# from types import SimpleNamespace
+# from unittest.mock import Mock, patch
+
+# import pytest
 
 # from ..release import main as release_main
 # from ..release_parser import ReleaseParser, ReleaseInfo
@@ -24,163 +26,150 @@
 #             return Mock(decode=lambda: "# Changelog\n".encode())
 #         return None
 
-# class MockGitlab:
-#     def __init__(self, url, private_token):
-#         self.url = url
-#         self.private_token = private_token
-#         self._project = MockGitlabProject()
-
-#     def projects(self):
-#         return Mock(get=lambda id: self._project)
-
-# class IntegrationTests(unittest.TestCase):
-#     @classmethod
-#     def setUpClass(cls):
-#         # Создаем временную директорию для тестов
-#         cls.temp_dir = tempfile.mkdtemp()
-#         cls.build_dir = os.path.join(cls.temp_dir, "build")
-#         os.makedirs(cls.build_dir, exist_ok=True)
-
-#     def setUp(self):
-#         # Подготавливаем тестовые файлы
-#         self.release_json = {
-#             "cmake_project_name": "test_project",
-#             "git_project_id": 123,
-#             "branch_name": "release/v1.0",
-#             "targets": [
-#                 {"hard_num": 1, "variant_num": 1},
-#                 {"hard_num": 1, "variant_num": 2}
-#             ],
-#             "features": ["[TEST-1] New feature"],
-#             "bug_fixes": ["[TEST-2] Bug fix"],
-#             "is_service_firmware": False,
-#             "upgrade_to_release": False
-#         }
-
-#         self.defs_h_content = """
+# @pytest.fixture
+# def run_calls(monkeypatch):
+#     # Вместо patch('subprocess.run'): заглушка, которая только запоминает аргументы вызовов
+#     calls = []
+#     monkeypatch.setattr(subprocess, 'run', lambda *args, **kwargs: calls.append((args, kwargs)))
+#     return calls
+
+# @pytest.fixture(scope="session")
+# def gitlab_project():
+#     # Mock-дерево проекта строится один раз на сессию
+#     return MockGitlabProject()
+
+# @pytest.fixture
+# def mock_gitlab(monkeypatch, gitlab_project):
+#     # Клиент — простой SimpleNamespace с единственным используемым атрибутом projects.get
+#     gl = SimpleNamespace(projects=SimpleNamespace(get=lambda id: gitlab_project))
+#     monkeypatch.setattr('gitlab.Gitlab', lambda *args, **kwargs: gl)
+#     return gl, gitlab_project
+
+# RELEASE_JSON = {
+#     "cmake_project_name": "test_project",
+#     "git_project_id": 123,
+#     "branch_name": "release/v1.0",
+#     "targets": [
+#         {"hard_num": 1, "variant_num": 1},
+#         {"hard_num": 1, "variant_num": 2}
+#     ],
+#     "features": ["[TEST-1] New feature"],
+#     "bug_fixes": ["[TEST-2] Bug fix"],
+#     "is_service_firmware": False,
+#     "upgrade_to_release": False
+# }
+
+# DEFS_H = """
 # #define PRODUCT_ID 1
 # #define PRODUCT_VERSION 2
 # #define PRODUCT_VARIANT_MINOR_VER 3
 # #define PRODUCT_REVISION 4
-#         """
-
-#         # Создаем тестовые файлы
-#         self.release_json_path = os.path.join(self.temp_dir, "release.json")
-#         self.defs_h_path = os.path.join(self.temp_dir, "defs.h")
-
-#         with open(self.release_json_path, 'w') as f:
-#             json.dump(self.release_json, f)
-
-#         with open(self.defs_h_path, 'w') as f:
-#             f.write(self.defs_h_content)
-
-#     def test_full_release_process(self):
-#         """
-#         Тестирование полного процесса релиза:
-#         1. Парсинг конфигурации
-#         2. Инициализация GitLab
-#         3. Валидация данных
-#         4. Сборка проекта
-#         5. Создание тегов
-#         6. Обновление changelog
-#         """
-#         with patch('gitlab.Gitlab', MockGitlab), \
-#              patch('subprocess.run') as mock_run, \
-#              patch.dict(os.environ, {'RELEASE_TOKEN': 'fake_token', 
-#                                    'EXPECTED_TARGETS': 'test_project_hard1_var1,test_project_hard1_var2'}):
-
-#             # 1. Тестируем парсинг
-#             parser = ReleaseParser(self.release_json_path, self.defs_h_path)
-#             info = parser.parse()
-#             self.assertIsInstance(info, ReleaseInfo)
-#             self.assertEqual(len(info.targets), 2)
-
-#             # 2. Тестируем инициализацию GitLab
-#             rep = GitlabRep('https://gitlab.example.com', 123, 'fake_token', info, self.build_dir)
-#             project = rep.get_project_obj()
-#             self.assertIsNotNone(project)
-
-#             # 3. Тестируем сборку
-#             rep.build_project()
-#             mock_run.assert_any_call(["cmake", "-B", self.build_dir, "-G", "Ninja"], check=True)
-
-#             # 4. Тестируем создание тегов
-#             for target in info.targets:
-#                 tag_generator = GeneratorTag(
-#                     rep, 
-#                     target.tag_name,
-#                     info.features,
-#                     info.bug_fixes,
-#                     "main"
-#                 )
-#                 url = tag_generator.generate()
-#                 self.assertTrue(url.startswith("https://"))
-
-#             # 5. Тестируем обновление changelog
-#             changelog = ChangelogGenerator()
-#             changelog.update_changelog_and_push(
-#                 info, 
+# """
+
+# @pytest.fixture(scope="session")
+# def release_files(tmp_path_factory):
+#     # Тестовые файлы создаются один раз на всю сессию; тесты их не изменяют
+#     d = tmp_path_factory.mktemp("rel")
+#     (d / "build").mkdir()
+#     (d / "release.json").write_text(json.dumps(RELEASE_JSON))
+#     (d / "defs.h").write_text(DEFS_H)
+#     return d
+
+# @pytest.fixture
+# def writable_release_files(release_files, tmp_path):
+#     # Для тестов, которые переписывают release.json: собственная копия файлов
+#     for name in ("release.json", "defs.h"):
+#         shutil.copyfile(release_files / name, tmp_path / name)
+#     (tmp_path / "build").mkdir()
+#     return tmp_path
+
+# def test_full_release_process(release_files, mock_gitlab, run_calls):
+#     """
+#     Тестирование полного процесса релиза:
+#     1. Парсинг конфигурации
+#     2. Инициализация GitLab
+#     3. Валидация данных
+#     4. Сборка проекта
+#     5. Создание тегов
+#     6. Обновление changelog
+#     """
+#     build_dir = str(release_files / "build")
+#     with patch.dict(os.environ, {'RELEASE_TOKEN': 'fake_token', 
+#                                  'EXPECTED_TARGETS': 'test_project_hard1_var1,test_project_hard1_var2'}):
+
+#         # 1. Тестируем парсинг
+#         parser = ReleaseParser(str(release_files / "release.json"), str(release_files / "defs.h"))
+#         info = parser.parse()
+#         assert isinstance(info, ReleaseInfo)
+#         assert len(info.targets) == 2
+
+#         # 2. Тестируем инициализацию GitLab
+#         rep = GitlabRep('https://gitlab.example.com', 123, 'fake_token', info, build_dir)
+#         project = rep.get_project_obj()
+#         assert project is not None
+
+#         # 3. Тестируем сборку
+#         rep.build_project()
+#         assert ((["cmake", "-B", build_dir, "-G", "Ninja"],), {"check": True}) in run_calls
+
+#         # 4. Тестируем создание тегов
+#         for target in info.targets:
+#             tag_generator = GeneratorTag(
 #                 rep, 
-#                 "changelog-update", 
-#                 "Update changelog for release"
+#                 target.tag_name,
+#                 info.features,
+#                 info.bug_fixes,
+#                 "main"
 #             )
-
-#     def test_upgrade_to_release_process(self):
-#         """
-#         Тестирование процесса обновления до релизной версии
-#         """
-#         self.release_json["upgrade_to_release"] = True
-        
-#         with open(self.release_json_path, 'w') as f:
-#             json.dump(self.release_json, f)
-
-#         with patch('gitlab.Gitlab', MockGitlab), \
-#              patch('subprocess.run') as mock_run, \
-#              patch.dict(os.environ, {'RELEASE_TOKEN': 'fake_token'}):
-
-#             parser = ReleaseParser(self.release_json_path, self.defs_h_path)
-#             info = parser.parse()
-#             self.assertTrue(info.upgrade_to_release)
-
-#             rep = GitlabRep('https://gitlab.example.com', 123, 'fake_token', info, self.build_dir)
-            
-#             # В режиме upgrade_to_release не должно быть сборки
-#             rep.build_project()
-#             mock_run.assert_not_called()
-
-#     def test_error_handling(self):
-#         """
-#         Тестирование обработки ошибок
-#         """
-#         # Тест с некорректным JSON
-#         invalid_json_path = os.path.join(self.temp_dir, "invalid.json")
-#         with open(invalid_json_path, 'w') as f:
-#             f.write("{invalid json")
-
-#         with self.assertRaises(json.JSONDecodeError):
-#             ReleaseParser(invalid_json_path, self.defs_h_path).parse()
-
-#         # Тест с отсутствующими обязательными полями
-#         invalid_release = self.release_json.copy()
-#         del invalid_release["git_project_id"]
+#             url = tag_generator.generate()
+#             assert url.startswith("https://")
+
+#         # 5. Тестируем обновление changelog
+#         changelog = ChangelogGenerator()
+#         changelog.update_changelog_and_push(
+#             info, 
+#             rep, 
+#             "changelog-update", 
+#             "Update changelog for release"
+#         )
+
+# def test_upgrade_to_release_process(writable_release_files, mock_gitlab, run_calls):
+#     """
+#     Тестирование процесса обновления до релизной версии
+#     """
+#     release_json_path = writable_release_files / "release.json"
+#     release_json_path.write_text(json.dumps(dict(RELEASE_JSON, upgrade_to_release=True)))
+
+#     with patch.dict(os.environ, {'RELEASE_TOKEN': 'fake_token'}):
+
+#         parser = ReleaseParser(str(release_json_path), str(writable_release_files / "defs.h"))
+#         info = parser.parse()
+#         assert info.upgrade_to_release
+
+#         rep = GitlabRep('https://gitlab.example.com', 123, 'fake_token', info, str(writable_release_files / "build"))
         
-#         with open(self.release_json_path, 'w') as f:
-#             json.dump(invalid_release, f)
-
-#         with self.assertRaises(ValueError):
-#             ReleaseParser(self.release_json_path, self.defs_h_path).parse()
-
-#     def tearDown(self):
-#         # Очистка временных файлов
-#         for file in [self.release_json_path, self.defs_h_path]:
-#             if os.path.exists(file):
-#                 os.remove(file)
-
-#     @classmethod
-#     def tearDownClass(cls):
-#         # Удаление временной директории
-#         import shutil
-#         shutil.rmtree(cls.temp_dir)
-
-# if __name__ == '__main__':
-#     unittest.main()
\ No newline at end of file
+#         # В режиме upgrade_to_release не должно быть сборки
+#         rep.build_project()
+#         assert not run_calls
+
+# def test_error_handling(release_files, tmp_path):
+#     """
+#     Тестирование обработки ошибок
+#     """
+#     defs_h_path = str(release_files / "defs.h")
+
+#     # Тест с некорректным JSON
+#     invalid_json_path = tmp_path / "invalid.json"
+#     invalid_json_path.write_text("{invalid json")
+
+#     with pytest.raises(json.JSONDecodeError):
+#         ReleaseParser(str(invalid_json_path), defs_h_path).parse()
+
+#     # Тест с отсутствующими обязательными полями
+#     invalid_release = RELEASE_JSON.copy()
+#     del invalid_release["git_project_id"]
+#     invalid_release_path = tmp_path / "release.json"
+#     invalid_release_path.write_text(json.dumps(invalid_release))
+
+#     with pytest.raises(ValueError):
+#         ReleaseParser(str(invalid_release_path), defs_h_path).parse()
@@ -0,0 +1,13 @@
+from ..jira_tasks import extract_jira_tasks
+
+
+def test_extract_jira_tasks_first_reference_per_item():
+    """Only the first task reference of each item is taken"""
+    items = ["[AB-1] feature [AB-2]", "no task", "[AB-1] again", "[CD-3] fix"]
+    assert extract_jira_tasks(items) == {"AB-1", "CD-3"}
+
+
+def test_extract_jira_tasks_non_ascii_marker():
+    """Non-ASCII markers are task references too"""
+    items = ["[ЗАДАЧА-1] новая функция", "[Доработка] улучшение"]
+    assert extract_jira_tasks(iter(items)) == {"ЗАДАЧА-1", "Доработка"}
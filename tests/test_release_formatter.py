@@ -1,117 +1,96 @@
-import unittest
+import pytest
 from release_formatter import ReleaseFormatter, _calc_minor
 
-class TestReleaseFormatter(unittest.TestCase):
-    def setUp(self):
-        # Test data setup
-        self.json_data = {
-            "hard_num": 1,
-            "variant_num": 2,
-            "is_service_firmware": False
-        }
-        self.defs_data = {
-            "proj_id": 1,
-            "major_ver": 2,
-            "minor_ver": 3,
-            "revision_ver": 4
-        }
-        self.service_json_data = {
-            "hard_num": 1,
-            "variant_num": 2,
-            "is_service_firmware": True
-        }
+@pytest.mark.parametrize("variant_num, minor_ver, expected", [
+    pytest.param(1, 1, 1, id="first_variant_first_minor"),
+    pytest.param(2, 3, 19, id="second_variant_third_minor"),
+    pytest.param(16, 15, 239, id="max_values"),
+    pytest.param(1, 15, 15, id="first_variant_max_minor"),
+    pytest.param(16, 1, 225, id="max_variant_first_minor"),
+])
+def test_calc_minor(variant_num, minor_ver, expected):
+    """Test minor version calculation"""
+    assert _calc_minor(variant_num, minor_ver) == expected
 
-    def test_calc_minor(self):
-        """Test minor version calculation"""
-        test_cases = [
-            # variant_num, minor_ver, expected
-            (1, 1, 1),           # First variant, first minor
-            (2, 3, 19),          # Second variant, third minor
-            (16, 15, 239),       # Max values
-            (1, 15, 15),         # First variant, max minor
-            (16, 1, 225)         # Max variant, first minor
-        ]
-        
-        for variant_num, minor_ver, expected in test_cases:
-            with self.subTest(variant_num=variant_num, minor_ver=minor_ver):
-                result = _calc_minor(variant_num, minor_ver)
-                self.assertEqual(result, expected)
+@pytest.mark.parametrize("variant_num, minor_ver", [
+    pytest.param(0, 1, id="variant_zero"),
+    pytest.param(17, 1, id="variant_too_big"),
+    pytest.param(1, 0, id="minor_zero"),
+    pytest.param(1, 16, id="minor_too_big"),
+])
+def test_calc_minor_out_of_range(variant_num, minor_ver):
+    """Test minor version calculation: out-of-range input"""
+    with pytest.raises(ValueError):
+        _calc_minor(variant_num, minor_ver)
 
-    def test_make_tag_name_normal(self):
-        """Test tag name generation for normal firmware"""
-        expected = "v1.2.19.1-Rev4"  # 19 = ((2-1) << 4) | 3
-        result = ReleaseFormatter.make_tag_name_from_dict(self.json_data, self.defs_data)
-        self.assertEqual(result, expected)
+@pytest.mark.parametrize("tag", [
+    pytest.param(tag, id=tag) for tag in [
+        "v1.2.3.4-Rev5",
+        "v1.2.3.4-Rev5-release",
+        "v255.255.255.255-Rev255",
+        "v1.1.1.1-Rev1",
+    ]
+])
+def test_validate_tag_string_valid(tag):
+    """Test tag string validation: valid tags"""
+    assert ReleaseFormatter.validate_tag_string(tag)
 
-    def test_make_tag_name_service(self):
-        """Test tag name generation for service firmware"""
-        expected = "v1.2.19.1-Rev255"  # Service firmware always has Rev255
-        result = ReleaseFormatter.make_tag_name_from_dict(self.service_json_data, self.defs_data)
-        self.assertEqual(result, expected)
+@pytest.mark.parametrize("tag", [
+    pytest.param(tag, id=tag) for tag in [
+        "v1.2.3.4",                    # Missing Rev
+        "v1.2.3.4-Rev",               # Missing Rev number
+        "v1.2.3.4-Rev5-invalid",      # Invalid suffix
+        "v256.1.1.1-Rev1",            # Number too large
+        "v1.1.1.1-Rev256",            # Rev too large
+        "1.2.3.4-Rev5",               # Missing v prefix
+        "v1.2.3.4.5-Rev5",            # Too many version numbers
+        "va.2.3.4-Rev5",              # Invalid version number
+        "v1.2.3.4-RevA",              # Invalid Rev number
+        "v0.2.3.4-Rev5",              # Zero is out of range
+        "v01.2.3.4-Rev5",             # Leading zero
+        "v\u0661.2.3.4-Rev5"          # Non-ASCII digit
+    ]
+])
+def test_validate_tag_string_invalid(tag):
+    """Test tag string validation: invalid tags"""
+    assert not ReleaseFormatter.validate_tag_string(tag)
 
-    def test_make_container_name(self):
-        """Test container name generation"""
-        expected = "1.002.019.001.btl.bin"
-        result = ReleaseFormatter.make_container_name_from_dict(self.json_data, self.defs_data)
-        self.assertEqual(result, expected)
+@pytest.mark.parametrize("make_name, json_key, expected", [
+    # 19 = ((2-1) << 4) | 3
+    pytest.param(ReleaseFormatter.make_tag_name_from_dict, "json_data", "v1.2.19.1-Rev4", id="tag_normal"),
+    # Service firmware always has Rev255
+    pytest.param(ReleaseFormatter.make_tag_name_from_dict, "service_json_data", "v1.2.19.1-Rev255", id="tag_service"),
+    pytest.param(ReleaseFormatter.make_container_name_from_dict, "json_data", "1.002.019.001.btl.bin", id="container"),
+])
+def test_make_name_from_dict(make_name, json_key, expected, defs_data, request):
+    """Test tag and container name generation from json/defs dictionaries"""
+    assert make_name(request.getfixturevalue(json_key), defs_data) == expected
 
-    def test_validate_tag_string(self):
-        """Test tag string validation"""
-        valid_tags = [
-            "v1.2.3.4-Rev5",
-            "v1.2.3.4-Rev5-release",
-            "v255.255.255.255-Rev255",
-            "v1.1.1.1-Rev1"
-        ]
-        invalid_tags = [
-            "v1.2.3.4",                    # Missing Rev
-            "v1.2.3.4-Rev",               # Missing Rev number
-            "v1.2.3.4-Rev5-invalid",      # Invalid suffix
-            "v256.1.1.1-Rev1",            # Number too large
-            "v1.1.1.1-Rev256",            # Rev too large
-            "1.2.3.4-Rev5",               # Missing v prefix
-            "v1.2.3.4.5-Rev5",            # Too many version numbers
-            "va.2.3.4-Rev5",              # Invalid version number
-            "v1.2.3.4-RevA"               # Invalid Rev number
-        ]
+def test_make_names_from_values():
+    """Test tag and container name generation from plain values"""
+    assert ReleaseFormatter.make_tag_name(1, 2, 3, 1, 2, False, 4) == "v1.2.19.1-Rev4"
+    assert ReleaseFormatter.make_tag_name(1, 2, 3, 1, 2, True, 4) == "v1.2.19.1-Rev255"
+    assert ReleaseFormatter.make_container_name(1, 2, 3, 1, 2) == "1.002.019.001.btl.bin"
 
-        for tag in valid_tags:
-            with self.subTest(tag=tag):
-                self.assertTrue(ReleaseFormatter.validate_tag_string(tag))
+@pytest.fixture(scope="module")
+def max_case():
+    """Maximum values"""
+    return (
+        {"hard_num": 255, "variant_num": 16},
+        {"proj_id": 255, "major_ver": 255, "minor_ver": 15, "revision_ver": 255},
+    )
 
-        for tag in invalid_tags:
-            with self.subTest(tag=tag):
-                self.assertFalse(ReleaseFormatter.validate_tag_string(tag))
+@pytest.fixture(scope="module")
+def min_case():
+    """Minimum values"""
+    return (
+        {"hard_num": 1, "variant_num": 1},
+        {"proj_id": 1, "major_ver": 1, "minor_ver": 1, "revision_ver": 1},
+    )
 
-    def test_version_ranges(self):
-        """Test version number ranges"""
-        # Test maximum values
-        max_json = {
-            "hard_num": 255,
-            "variant_num": 16
-        }
-        max_defs = {
-            "proj_id": 255,
-            "major_ver": 255,
-            "minor_ver": 15,
-            "revision_ver": 255
-        }
-        max_tag = ReleaseFormatter.make_tag_name_from_dict(max_json, max_defs)
-        self.assertTrue(ReleaseFormatter.validate_tag_string(max_tag))
-
-        # Test minimum values
-        min_json = {
-            "hard_num": 1,
-            "variant_num": 1
-        }
-        min_defs = {
-            "proj_id": 1,
-            "major_ver": 1,
-            "minor_ver": 1,
-            "revision_ver": 1
-        }
-        min_tag = ReleaseFormatter.make_tag_name_from_dict(min_json, min_defs)
-        self.assertTrue(ReleaseFormatter.validate_tag_string(min_tag))
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+@pytest.mark.parametrize("case", ["max_case", "min_case"])
+def test_version_ranges(case, request):
+    """Test version number ranges"""
+    json_data, defs_data = request.getfixturevalue(case)
+    tag = ReleaseFormatter.make_tag_name_from_dict(json_data, defs_data)
+    assert ReleaseFormatter.validate_tag_string(tag)
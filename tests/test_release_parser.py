@@ -0,0 +1,39 @@
+import pytest
+from ..release_parser import ReleaseParser
+
+
+def parse_defs(tmp_path, text):
+    defs_path = tmp_path / "defs.h"
+    defs_path.write_text(text, encoding="utf-8")
+    return ReleaseParser("release.json", str(defs_path)).parse_defs(str(defs_path))
+
+
+def test_parse_defs_parenthesised_values(tmp_path):
+    """Values in parentheses are parsed like plain ones"""
+    text = ("#define PRODUCT_ID (1)\n#define PRODUCT_VERSION (2)\n"
+            "#define PRODUCT_VARIANT_MINOR_VER (3)\n#define PRODUCT_REVISION (4)\n")
+    assert parse_defs(tmp_path, text) == {"proj_id": 1, "major_ver": 2, "minor_ver": 3, "revision_ver": 4}
+
+
+def test_parse_defs_first_definition_wins(tmp_path):
+    """A duplicate define keeps the first value"""
+    text = ("#define PRODUCT_ID 1\n#define PRODUCT_VERSION 2\n#define PRODUCT_VARIANT_MINOR_VER 3\n"
+            "#define PRODUCT_REVISION 4\n#define PRODUCT_ID 9\n#define PRODUCT_REVISION 8\n")
+    assert parse_defs(tmp_path, text) == {"proj_id": 1, "major_ver": 2, "minor_ver": 3, "revision_ver": 4}
+
+
+def test_parse_defs_whitespace_and_comments(tmp_path):
+    """Extra whitespace and trailing comments around the values are ignored"""
+    text = ("/* Product versions */\n"
+            "#define   PRODUCT_ID\t\t1   // project\n"
+            "#define\tPRODUCT_VERSION    (2) /* major */\n"
+            "#define PRODUCT_VARIANT_MINOR_VER  3\r\n"
+            "#define PRODUCT_REVISION\t4\n")
+    assert parse_defs(tmp_path, text) == {"proj_id": 1, "major_ver": 2, "minor_ver": 3, "revision_ver": 4}
+
+
+def test_parse_defs_missing_define(tmp_path):
+    """A missing define raises ValueError"""
+    text = "#define PRODUCT_ID 1\n#define PRODUCT_VERSION 2\n#define PRODUCT_VARIANT_MINOR_VER 3\n"
+    with pytest.raises(ValueError, match="PRODUCT_REVISION"):
+        parse_defs(tmp_path, text)